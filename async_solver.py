@@ -0,0 +1,53 @@
+from board import Sudoku
+from strategies import *
+
+import asyncio
+import threading
+
+async def solve_async(sudoku, max_difficulty=None, exclude=None, include_only=None):
+	"""Solve a board like Sudoku.solve, yielding control to the event loop
+	before each strategy it tries.
+
+	A single strategy still runs to completion without yielding, so a hard board
+	can hold the loop for as long as one forcing chain search takes. Use
+	solve_in_executor to keep the loop fully responsive. If the task is
+	cancelled, the board is left partially solved."""
+	difficulty = 0
+	while not sudoku.solved():
+		for strategy_difficulty, strategy in sudoku.strategies_for(max_difficulty, exclude,
+			include_only):
+			await asyncio.sleep(0)
+			if strategy.function(sudoku, False):
+				difficulty = max(difficulty, strategy_difficulty)
+				break
+		else:
+			break
+	return sudoku.strategies[difficulty].name
+
+async def solve_in_executor(sudoku, max_difficulty=None, exclude=None, include_only=None,
+	executor=None):
+	"""Solve a board like Sudoku.solve in a thread pool executor (by default,
+	the event loop's own).
+
+	If the task is cancelled, the solving thread stops at the next strategy
+	boundary and the board is left partially solved."""
+	cancelled = threading.Event()
+	def solve():
+		difficulty = 0
+		while not sudoku.solved():
+			for strategy_difficulty, strategy in sudoku.strategies_for(max_difficulty, exclude,
+				include_only):
+				if cancelled.is_set():
+					return sudoku.strategies[difficulty].name
+				if strategy.function(sudoku, False):
+					difficulty = max(difficulty, strategy_difficulty)
+					break
+			else:
+				break
+		return sudoku.strategies[difficulty].name
+	loop = asyncio.get_running_loop()
+	try:
+		return await loop.run_in_executor(executor, solve)
+	except asyncio.CancelledError:
+		cancelled.set()
+		raise
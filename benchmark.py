@@ -0,0 +1,255 @@
+#!/usr/bin/env python
+
+from __future__ import print_function
+
+from board import Sudoku
+from strategies import *
+
+from argparse import ArgumentParser
+from collections import Counter
+import os
+import random
+import subprocess
+import sys
+import time
+
+# A board that only needs naked and hidden singles, like most boards that the
+# command line solves one at a time
+STARTUP_BOARD = '003020600900305001001806400008102900700000008006708200002609500800203009005010300'
+
+# The most milliseconds that `sudoku.py -q` should take to start up and solve
+# STARTUP_BOARD, beyond what the Python interpreter itself takes to start
+STARTUP_TARGET = 50.0
+
+def random_solution(box, rng):
+	"""Return a random solved NxN board (N = box**2) as a list of rows."""
+	n = box * box
+	grid = [[(box * (y % box) + y // box + x) % n + 1 for x in range(n)] for y in range(n)]
+	digits = list(range(1, n + 1))
+	rng.shuffle(digits)
+	bands = list(range(box))
+	rng.shuffle(bands)
+	ys = [band * box + y for band in bands for y in rng.sample(range(box), box)]
+	stacks = list(range(box))
+	rng.shuffle(stacks)
+	xs = [stack * box + x for stack in stacks for x in rng.sample(range(box), box)]
+	return [[digits[grid[y][x] - 1] for x in xs] for y in ys]
+
+def random_board(box, clues, max_difficulty, rng):
+	"""Return the digits (0 for unsolved) of a random NxN board with about the
+	given fraction of its cells given, plus as many more as it takes to be
+	solvable without strategies beyond max_difficulty."""
+	solution = [d for row in random_solution(box, rng) for d in row]
+	digits = [d if rng.random() < clues else 0 for d in solution]
+	while True:
+		board = Sudoku(digits)
+		board.solve(max_difficulty=max_difficulty)
+		unsolved = [c for c in board.cells() if not c.solved()]
+		if not unsolved:
+			return digits
+		cell = rng.choice(unsolved)
+		i = cell.y * box * box + cell.x
+		digits[i] = solution[i]
+
+def benchmark_sizes(boxes, num_boards, clues, max_difficulty, seed):
+	"""Print how long setting up and solving random boards takes as their size
+	grows, and the hardest strategies they needed.
+
+	The boards get clues added until they can be solved, which leaves them
+	easy: with the defaults, nearly all of them only need singles. So this
+	measures building boards and their indexes and the simplest strategies,
+	not how the more advanced strategies scale."""
+	print('size', 'boards', 'solved', 'mean setup seconds', 'mean seconds', 'max seconds',
+		'hardest strategies', sep='\t')
+	for box in boxes:
+		rng = random.Random(seed)
+		setup_times = []
+		times = []
+		num_solved = 0
+		hardest = Counter()
+		for _ in range(num_boards):
+			digits = random_board(box, clues, max_difficulty, rng)
+			start = time.time()
+			board = Sudoku(digits)
+			setup_times.append(time.time() - start)
+			start = time.time()
+			hardest[board.solve(max_difficulty=max_difficulty)] += 1
+			times.append(time.time() - start)
+			board.verify()
+			num_solved += board.solved()
+		size = '%dx%d' % (box * box, box * box)
+		print(size, num_boards, num_solved, '%.4f' % (sum(setup_times) / len(setup_times)),
+			'%.4f' % (sum(times) / len(times)), '%.4f' % max(times),
+			', '.join('%s %d' % (name, n) for name, n in hardest.most_common()), sep='\t')
+
+def deep_size(obj, seen):
+	"""Return the size in bytes of an object and everything it refers to,
+	except for classes and objects whose ids are already in seen."""
+	if id(obj) in seen or isinstance(obj, type):
+		return 0
+	seen.add(id(obj))
+	size = sys.getsizeof(obj)
+	if isinstance(obj, dict):
+		size += sum(deep_size(k, seen) + deep_size(v, seen) for k, v in obj.items())
+	elif isinstance(obj, (list, tuple, set, frozenset)):
+		size += sum(deep_size(x, seen) for x in obj)
+	if hasattr(obj, '__dict__'):
+		size += deep_size(obj.__dict__, seen)
+	for slot in getattr(type(obj), '__slots__', ()):
+		if hasattr(obj, slot):
+			size += deep_size(getattr(obj, slot), seen)
+	return size
+
+def benchmark_memory(file, num_boards, max_difficulty):
+	"""Print how much memory each board takes up, before and after solving."""
+	with open(file, 'r') as boards:
+		lines = [line.strip() for line in boards if line.strip() and not line.startswith('#')]
+	lines = lines[:num_boards]
+	# Tables shared by all boards of a size are not part of any one board
+	Sudoku(lines[0])
+	shared = set()
+	deep_size(Sudoku._peers, shared)
+	print('state', 'boards', 'bytes per board', sep='\t')
+	boards = [Sudoku(line) for line in lines]
+	print('unsolved', len(boards), sum(deep_size(b, set(shared)) for b in boards) // len(boards),
+		sep='\t')
+	for board in boards:
+		board.solve(max_difficulty=max_difficulty)
+	print('solved', len(boards), sum(deep_size(b, set(shared)) for b in boards) // len(boards),
+		sep='\t')
+
+def benchmark_uniqueness(file, num_boards):
+	"""Print how long solving a file of boards takes with and without the
+	uniqueness strategies, overall and for the boards that they take different
+	steps to solve."""
+	with open(file, 'r') as boards:
+		lines = [line.strip() for line in boards if line.strip() and not line.startswith('#')]
+	lines = lines[:num_boards]
+	times = {False: [], True: []}
+	solved = {False: 0, True: 0}
+	steps = {False: [], True: []}
+	for line in lines:
+		# Alternate between settings so that they share any drift in machine load
+		for unique in [False, True]:
+			board = Sudoku(line)
+			board.unique = unique
+			start = time.time()
+			steps[unique].append(list(board.solve_iter(exclude=[999])))
+			times[unique].append(time.time() - start)
+			board.verify()
+			solved[unique] += board.solved()
+	changed = [i for i in range(len(lines)) if steps[False][i] != steps[True][i]]
+	print('uniqueness', 'boards', 'solved', 'seconds', 'boards changed', 'seconds on those',
+		sep='\t')
+	for unique in [False, True]:
+		print('on' if unique else 'off', len(lines), solved[unique], '%.2f' % sum(times[unique]),
+			len(changed), '%.2f' % sum(times[unique][i] for i in changed), sep='\t')
+
+def benchmark_interpreters(interpreters, file, repeats):
+	"""Print how long each Python interpreter takes to solve a file of boards,
+	and whether it gets the same results as the first one."""
+	script = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'sudoku.py')
+	versions = [subprocess.check_output([interpreter, '-c',
+		'import platform; print(platform.python_version())']).decode('ascii').strip()
+		for interpreter in interpreters]
+	times = [[] for _ in interpreters]
+	outputs = [None for _ in interpreters]
+	# Alternate between interpreters so that they share any drift in machine load
+	for _ in range(repeats):
+		for i, interpreter in enumerate(interpreters):
+			start = time.time()
+			outputs[i] = subprocess.check_output([interpreter, script, '-f', file])
+			times[i].append(time.time() - start)
+	print('interpreter', 'version', 'best seconds', 'same results', sep='\t')
+	for interpreter, version, ts, output in zip(interpreters, versions, times, outputs):
+		print(interpreter, version, '%.2f' % min(ts),
+			'yes' if output == outputs[0] else 'NO', sep='\t')
+
+def benchmark_startup(board, repeats, target):
+	"""Print how long `sudoku.py -q` takes to start up and solve a board, beyond
+	what the Python interpreter itself takes to start, and whether that is
+	within the target."""
+	script = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'sudoku.py')
+	commands = [[sys.executable, '-c', 'pass'], [sys.executable, script, '-q', board]]
+	# Compiled modules are written on the first run, so that it is not timed
+	env = dict(os.environ)
+	env.pop('PYTHONDONTWRITEBYTECODE', None)
+	times = [[] for _ in commands]
+	with open(os.devnull, 'w') as devnull:
+		for command in commands:
+			subprocess.check_call(command, stdout=devnull, env=env)
+		# Alternate between commands so that they share any drift in machine load
+		for _ in range(repeats):
+			for i, command in enumerate(commands):
+				start = time.time()
+				subprocess.check_call(command, stdout=devnull, env=env)
+				times[i].append(time.time() - start)
+	medians = [sorted(ts)[len(ts) // 2] * 1000 for ts in times]
+	print('command', 'median ms', 'best ms', sep='\t')
+	for name, median, ts in zip(['python', 'sudoku.py -q'], medians, times):
+		print(name, '%.1f' % median, '%.1f' % (min(ts) * 1000), sep='\t')
+	overhead = medians[1] - medians[0]
+	print('overhead', '%.1f' % overhead, 'within %.0f ms target' % target if overhead <= target
+		else 'OVER %.0f ms target' % target, sep='\t')
+
+def main():
+	parser = ArgumentParser(description='Sudoku solver benchmarks')
+	subparsers = parser.add_subparsers(dest='benchmark')
+	sizes_parser = subparsers.add_parser('sizes',
+		help='measure how setup and solve time grow with board size, on random boards '
+			'that mostly only need singles')
+	sizes_parser.add_argument('-b', '--boxes', type=int, nargs='+', default=[2, 3, 4, 5],
+		help='box sizes of the boards to solve (default: 2 3 4 5, for 4x4 to 25x25)')
+	sizes_parser.add_argument('-n', '--boards', type=int, default=10,
+		help='number of random boards of each size (default: 10)')
+	sizes_parser.add_argument('-c', '--clues', type=float, default=0.6,
+		help='fraction of cells given at random in each board (default: 0.6)')
+	sizes_parser.add_argument('-d', '--max-difficulty', type=int, default=9,
+		help='most difficult strategy to use (default: 9, unit intersections)')
+	sizes_parser.add_argument('-s', '--seed', type=int, default=0,
+		help='random seed for generating boards (default: 0)')
+	memory_parser = subparsers.add_parser('memory',
+		help='measure how much memory each board takes up')
+	memory_parser.add_argument('-f', '--file', default='boards.txt',
+		help='text file of boards to measure (default: boards.txt)')
+	memory_parser.add_argument('-n', '--boards', type=int, default=1000,
+		help='number of boards from the file to measure (default: 1000)')
+	memory_parser.add_argument('-d', '--max-difficulty', type=int, default=9,
+		help='most difficult strategy to use (default: 9, unit intersections)')
+	uniqueness_parser = subparsers.add_parser('uniqueness',
+		help='measure how much time unique rectangles and BUG+1 save')
+	uniqueness_parser.add_argument('-f', '--file', default='boards.txt',
+		help='text file of boards to solve (default: boards.txt)')
+	uniqueness_parser.add_argument('-n', '--boards', type=int, default=1000,
+		help='number of boards from the file to solve (default: 1000)')
+	interpreters_parser = subparsers.add_parser('interpreters',
+		help='compare how fast different Python interpreters solve a file of boards')
+	interpreters_parser.add_argument('FILE',
+		help='text or packed file of boards to solve')
+	interpreters_parser.add_argument('-i', '--interpreters', nargs='+', default=[sys.executable],
+		help='Python interpreters to run the solver with (default: this one)')
+	interpreters_parser.add_argument('-r', '--repeats', type=int, default=3,
+		help='number of times to solve the file with each interpreter (default: 3)')
+	startup_parser = subparsers.add_parser('startup',
+		help='measure how long sudoku.py -q takes to start up and solve a board')
+	startup_parser.add_argument('-b', '--board', default=STARTUP_BOARD,
+		help='board to solve (default: one that only needs naked and hidden singles)')
+	startup_parser.add_argument('-r', '--repeats', type=int, default=21,
+		help='number of times to run each command (default: 21)')
+	startup_parser.add_argument('-t', '--target', type=float, default=STARTUP_TARGET,
+		help='most milliseconds sudoku.py -q should take beyond starting Python '
+			'(default: %.0f)' % STARTUP_TARGET)
+	args = parser.parse_args()
+	if args.benchmark == 'sizes':
+		benchmark_sizes(args.boxes, args.boards, args.clues, args.max_difficulty, args.seed)
+	elif args.benchmark == 'memory':
+		benchmark_memory(args.file, args.boards, args.max_difficulty)
+	elif args.benchmark == 'uniqueness':
+		benchmark_uniqueness(args.file, args.boards)
+	elif args.benchmark == 'interpreters':
+		benchmark_interpreters(args.interpreters, args.FILE, args.repeats)
+	elif args.benchmark == 'startup':
+		benchmark_startup(args.board, args.repeats, args.target)
+
+if __name__ == '__main__':
+	main()
@@ -4,31 +4,72 @@ from utils import *
 from color import *
 from cell import *
 
+from binascii import hexlify, unhexlify
 from collections import namedtuple
 from itertools import product
 from functools import wraps
+from timeit import default_timer
+import weakref
 
 Strategy = namedtuple('Strategy', ('name', 'function'))
 
+# One deduction made by a strategy: the candidates it eliminated and the values
+# it placed, as lists of (cell name, digit) pairs, and the names of the cells in
+# the pattern it was deduced from
+Step = namedtuple('Step', ('difficulty', 'strategy', 'eliminations', 'placements',
+	'cells'))
+
+class StepTaken(Exception):
+	"""Raised to stop a strategy at its first deduction while taking steps."""
+
+	def __init__(self, cells):
+		Exception.__init__(self, 'step taken')
+		self.cells = cells
+
 class Sudoku(object):
-	"""A 9x9 Sudoku board."""
+	"""An NxN Sudoku board, where N is a square number (usually 9)."""
 
 	UNIT_TYPES = ['row', 'column', 'block']
 
 	# A dictionary of solution strategies, keyed by their increasing difficulty
 	strategies = {0: Strategy('nothing', lambda sudoku, verbose: False)}
 
+	# Whether strategies that stop after their first elimination should instead
+	# apply every elimination they can find in one pass
+	exhaustive = False
+
+	# Whether strategies may assume that the board has exactly one solution,
+	# as the uniqueness strategies do (turn it off for boards that may have more)
+	unique = True
+
+	# Objects to notify around every strategy call, through their methods
+	# start(sudoku, name, difficulty) and
+	# end(sudoku, name, difficulty, seconds, changed)
+	hooks = []
+
+	# A pool of processes with a first(sudoku, solve_from, starts) method, to
+	# search the starting points of the slowest strategies in parallel, or None
+	pool = None
+
+	# Whether the steps method is taking a step on this board, so strategies
+	# stop at their first deduction (see the deduced method)
+	stepping = False
+
 	@classmethod
-	def strategy(cls, name, difficulty):
-		"""Decorate a strategy function to register it for use in the solve method."""
+	def strategy(cls, name, difficulty, uniqueness=False):
+		"""Decorate a strategy function to register it for use in the solve method.
+		A uniqueness strategy is only used on boards that have a unique solution."""
 		def decorator(function):
 			@wraps(function)
 			def wrapper(sudoku, verbose):
-				if sudoku.solved():
+				if sudoku.solved() or (uniqueness and not sudoku.unique):
 					return False
 				if verbose:
 					print('Try', name)
-				changed = function(sudoku, verbose)
+				if cls.hooks:
+					changed = cls._call_hooked(function, sudoku, name, difficulty, verbose)
+				else:
+					changed = function(sudoku, verbose)
 				if verbose and not changed:
 					print('...No', name, 'found')
 				return changed
@@ -36,22 +77,150 @@ class Sudoku(object):
 			return wrapper
 		return decorator
 
+	@classmethod
+	def _call_hooked(cls, function, sudoku, name, difficulty, verbose):
+		"""Call a strategy function, notifying the hooks before and after."""
+		hooks = list(cls.hooks)
+		for hook in hooks:
+			hook.start(sudoku, name, difficulty)
+		changed = False
+		start = default_timer()
+		try:
+			changed = function(sudoku, verbose)
+		finally:
+			seconds = default_timer() - start
+			for hook in reversed(hooks):
+				hook.end(sudoku, name, difficulty, seconds, changed)
+		return changed
+
 	def __init__(self, *cells):
 		if len(cells) == 1:
 			cells = cells[0]
 			if isinstance(cells, str):
-				cells = filter(None, (c if c in map(str, Cell.VALUES) else
-					'0' if c in '0._*' else '' for c in cells))
+				cells = [c for c in cells if c in Cell.SYMBOLS or c in '0._*']
 			cells = list(cells)
-		if len(cells) == 9:
+		if all(isinstance(row, (list, tuple, str)) and len(row) == len(cells) for row in cells):
 			cells = flatten(map(list, cells))
-		if len(cells) != 81:
+		self.size = int(round(len(cells) ** 0.5))
+		self.box = int(round(self.size ** 0.5))
+		if self.box < 2 or self.box ** 4 != len(cells) or self.size > len(Cell.SYMBOLS):
 			raise ValueError('Invalid Sudoku board: %r' % (cells,))
+		self.values = list(range(1, self.size + 1))
 		self.cm = []
 		while cells:
-			row, cells = cells[:9], cells[9:]
-			row = [Cell(i, len(self.cm), d) for i, d in enumerate(row)]
+			row, cells = cells[:self.size], cells[self.size:]
+			row = [Cell(i, len(self.cm), d, self.size) for i, d in enumerate(row)]
+			self.cm.append(row)
+		self._index_cells()
+
+	def _index_cells(self):
+		"""Build the candidate indexes for the cells in self.cm."""
+		# The positions of each candidate in each unit, as bitmasks indexed by
+		# unit and candidate
+		self.locations = [[0] * (self.size + 1) for _ in range(3 * self.size)]
+		# The cells with each candidate, as bitmasks of cell indexes
+		self.candidate_cells = [0] * (self.size + 1)
+		# The cells with two or three candidates, as bitmasks of cell indexes
+		# keyed by their candidates' bitmask
+		self.cells_by_candidates = {}
+		# The values and positions of the solved cells in each unit, as bitmasks
+		# indexed by unit
+		self.solved_values = [0] * (3 * self.size)
+		self.solved_positions = [0] * (3 * self.size)
+		self.cell_list = flatten(self.cm)
+		self.peers, self.peer_lists = self.peer_masks(self.size)
+		self.unit_cells = self.unit_masks(self.size)
+		sudoku_ref = weakref.ref(self)
+		for cell in self.cell_list:
+			bit = 1 << self.cell_index(cell)
+			for u, p in self.unit_positions(cell):
+				for d in cell.ds:
+					self.locations[u][d] |= 1 << p
+			for d in cell.ds:
+				self.candidate_cells[d] |= bit
+			if len(cell.ds) in [2, 3]:
+				self.cells_by_candidates[cell.mask] = self.cells_by_candidates.get(cell.mask, 0) | bit
+			if cell.solved():
+				for u, p in self.unit_positions(cell):
+					self.solved_values[u] |= cell.mask
+					self.solved_positions[u] |= 1 << p
+			cell.sudoku_ref = sudoku_ref
+		self.peer_lists = [[self.cell_list[j] for j in peers] for peers in self.peer_lists]
+
+	def to_bytes(self):
+		"""Return the candidates of every cell packed into bytes: one byte for
+		the box size, then N bits per cell (93 bytes in all for a 9x9 board)."""
+		packed = 0
+		for cell in reversed(self.cell_list):
+			packed = packed << self.size | cell.mask >> 1
+		length = (self.size ** 3 + 7) // 8
+		return bytes(bytearray([self.box])) + unhexlify('%0*x' % (2 * length, packed))
+
+	@classmethod
+	def from_bytes(cls, data):
+		"""Return a board with the candidates packed by to_bytes."""
+		sudoku = cls.__new__(cls)
+		sudoku._load_bytes(data)
+		return sudoku
+
+	def _load_bytes(self, data):
+		box = bytearray(data[:1])[0]
+		self.box = box
+		self.size = box * box
+		self.values = list(range(1, self.size + 1))
+		packed = int(hexlify(data[1:]), 16)
+		full = (1 << self.size) - 1
+		self.cm = []
+		for y in range(self.size):
+			row = []
+			for x in range(self.size):
+				row.append(Cell.from_mask(x, y, (packed & full) << 1, self.size))
+				packed >>= self.size
 			self.cm.append(row)
+		self._index_cells()
+
+	def __getstate__(self):
+		return self.to_bytes(), self.exhaustive, self.unique
+
+	def __setstate__(self, state):
+		data, self.exhaustive, self.unique = state
+		self._load_bytes(data)
+
+	# The peers of each cell, as bitmasks and lists of cell indexes, keyed by
+	# board size
+	_peers = {}
+
+	@classmethod
+	def peer_masks(cls, size):
+		"""Return the peers of each cell on a board of the given size, as
+		bitmasks and as lists of cell indexes."""
+		if size not in cls._peers:
+			box = int(round(size ** 0.5))
+			positions = list(product(range(size), range(size)))
+			peers = [[y2 * size + x2 for y2, x2 in positions
+				if (y2 == y or x2 == x or (y2 // box, x2 // box) == (y // box, x // box)) and
+					(y2, x2) != (y, x)]
+				for y, x in positions]
+			cls._peers[size] = ([bitmask(p) for p in peers], peers)
+		return cls._peers[size]
+
+	# The cells in each unit (rows, then columns, then blocks), as bitmasks of
+	# cell indexes, keyed by board size
+	_units = {}
+
+	@classmethod
+	def unit_masks(cls, size):
+		"""Return the cells in each unit on a board of the given size, as
+		bitmasks indexed by unit."""
+		if size not in cls._units:
+			box = int(round(size ** 0.5))
+			positions = list(product(range(size), range(size)))
+			cls._units[size] = ([bitmask(y * size + x for y, x in positions if y == i)
+				for i in range(size)] +
+				[bitmask(y * size + x for y, x in positions if x == i) for i in range(size)] +
+				[bitmask(y * size + x for y, x in positions if y // box * box + x // box == i)
+					for i in range(size)])
+		return cls._units[size]
 
 	def __repr__(self):
 		return 'Sudoku(%r)' % self.code_str()
@@ -60,87 +229,86 @@ class Sudoku(object):
 		return self.terse_str() if self.solved() else self.verbose_str()
 
 	def code_str(self):
-		return ''.join(str(c.value()) for c in self.cells())
+		return ''.join(c.symbol() for c in self.cells())
 
 	def terse_str(self):
-		return '''    1 2 3   4 5 6   7 8 9
-  +-------+-------+-------+
-A | %s %s %s | %s %s %s | %s %s %s |
-B | %s %s %s | %s %s %s | %s %s %s |
-C | %s %s %s | %s %s %s | %s %s %s |
-  +-------+-------+-------+
-D | %s %s %s | %s %s %s | %s %s %s |
-E | %s %s %s | %s %s %s | %s %s %s |
-F | %s %s %s | %s %s %s | %s %s %s |
-  +-------+-------+-------+
-G | %s %s %s | %s %s %s | %s %s %s |
-H | %s %s %s | %s %s %s | %s %s %s |
-J | %s %s %s | %s %s %s | %s %s %s |
-  +-------+-------+-------+''' % tuple(c.value() for c in self.cells())
+		width = len(self.col_name(self.size - 1))
+		blocks = list(chunk(range(self.size), self.box))
+		border = '  +' + '+'.join('-' * (self.box * (width + 1) + 1) for _ in blocks) + '+'
+		lines = ['    ' + '   '.join(' '.join(self.col_name(x).rjust(width) for x in xs)
+			for xs in blocks)]
+		for ys in blocks:
+			lines.append(border)
+			for y in ys:
+				lines.append('%s | %s |' % (self.row_name(y), ' | '.join(
+					' '.join(self.cell(x, y).symbol().rjust(width) for x in xs)
+					for xs in blocks)))
+		lines.append(border)
+		return '\n'.join(lines)
 
 	def verbose_str(self):
-		s = flatten(list('   (%d)   ' % c.value()) if c.solved() else
-			[c.dcs.get(d, Color.NEITHER).colored(d) if d in c.ds else '.'
-				for d in Cell.VALUES] for c in self.cells())
-		return ('''     1   2   3     4   5   6     7   8   9
-  +-------------+-------------+-------------+
-  | %s%s%s %s%s%s %s%s%s | %s%s%s %s%s%s %s%s%s | %s%s%s %s%s%s %s%s%s |
-A | %s%s%s %s%s%s %s%s%s | %s%s%s %s%s%s %s%s%s | %s%s%s %s%s%s %s%s%s |
-  | %s%s%s %s%s%s %s%s%s | %s%s%s %s%s%s %s%s%s | %s%s%s %s%s%s %s%s%s |
-  |             |             |             |
-  | %s%s%s %s%s%s %s%s%s | %s%s%s %s%s%s %s%s%s | %s%s%s %s%s%s %s%s%s |
-B | %s%s%s %s%s%s %s%s%s | %s%s%s %s%s%s %s%s%s | %s%s%s %s%s%s %s%s%s |
-  | %s%s%s %s%s%s %s%s%s | %s%s%s %s%s%s %s%s%s | %s%s%s %s%s%s %s%s%s |
-  |             |             |             |
-  | %s%s%s %s%s%s %s%s%s | %s%s%s %s%s%s %s%s%s | %s%s%s %s%s%s %s%s%s |
-C | %s%s%s %s%s%s %s%s%s | %s%s%s %s%s%s %s%s%s | %s%s%s %s%s%s %s%s%s |
-  | %s%s%s %s%s%s %s%s%s | %s%s%s %s%s%s %s%s%s | %s%s%s %s%s%s %s%s%s |
-  +-------------+-------------+-------------+
-  | %s%s%s %s%s%s %s%s%s | %s%s%s %s%s%s %s%s%s | %s%s%s %s%s%s %s%s%s |
-D | %s%s%s %s%s%s %s%s%s | %s%s%s %s%s%s %s%s%s | %s%s%s %s%s%s %s%s%s |
-  | %s%s%s %s%s%s %s%s%s | %s%s%s %s%s%s %s%s%s | %s%s%s %s%s%s %s%s%s |
-  |             |             |             |
-  | %s%s%s %s%s%s %s%s%s | %s%s%s %s%s%s %s%s%s | %s%s%s %s%s%s %s%s%s |
-E | %s%s%s %s%s%s %s%s%s | %s%s%s %s%s%s %s%s%s | %s%s%s %s%s%s %s%s%s |
-  | %s%s%s %s%s%s %s%s%s | %s%s%s %s%s%s %s%s%s | %s%s%s %s%s%s %s%s%s |
-  |             |             |             |
-  | %s%s%s %s%s%s %s%s%s | %s%s%s %s%s%s %s%s%s | %s%s%s %s%s%s %s%s%s |
-F | %s%s%s %s%s%s %s%s%s | %s%s%s %s%s%s %s%s%s | %s%s%s %s%s%s %s%s%s |
-  | %s%s%s %s%s%s %s%s%s | %s%s%s %s%s%s %s%s%s | %s%s%s %s%s%s %s%s%s |
-  +-------------+-------------+-------------+
-  | %s%s%s %s%s%s %s%s%s | %s%s%s %s%s%s %s%s%s | %s%s%s %s%s%s %s%s%s |
-G | %s%s%s %s%s%s %s%s%s | %s%s%s %s%s%s %s%s%s | %s%s%s %s%s%s %s%s%s |
-  | %s%s%s %s%s%s %s%s%s | %s%s%s %s%s%s %s%s%s | %s%s%s %s%s%s %s%s%s |
-  |             |             |             |
-  | %s%s%s %s%s%s %s%s%s | %s%s%s %s%s%s %s%s%s | %s%s%s %s%s%s %s%s%s |
-H | %s%s%s %s%s%s %s%s%s | %s%s%s %s%s%s %s%s%s | %s%s%s %s%s%s %s%s%s |
-  | %s%s%s %s%s%s %s%s%s | %s%s%s %s%s%s %s%s%s | %s%s%s %s%s%s %s%s%s |
-  |             |             |             |
-  | %s%s%s %s%s%s %s%s%s | %s%s%s %s%s%s %s%s%s | %s%s%s %s%s%s %s%s%s |
-J | %s%s%s %s%s%s %s%s%s | %s%s%s %s%s%s %s%s%s | %s%s%s %s%s%s %s%s%s |
-  | %s%s%s %s%s%s %s%s%s | %s%s%s %s%s%s %s%s%s | %s%s%s %s%s%s %s%s%s |
-  +-------------+-------------+-------------+''' %
-		tuple(flatten(flatten(flatten(transpose(chunk(chunk(h, 3), 3))
-			for h in chunk(s, 81))))))
+		blocks = list(chunk(range(self.size), self.box))
+		block_width = self.box * self.box + self.box - 1
+		border = '  +' + '+'.join('-' * (block_width + 2) for _ in blocks) + '+'
+		spacer = '  |' + '|'.join(' ' * (block_width + 2) for _ in blocks) + '|'
+		header = [' '] * (4 + len(blocks) * (block_width + 3))
+		for x in range(self.size):
+			i = 4 + x // self.box * (block_width + 3) + x % self.box * (self.box + 1) + self.box // 2
+			header[i:i+len(self.col_name(x))] = self.col_name(x)
+		lines = [''.join(header).rstrip()]
+		for ys in blocks:
+			lines.append(border)
+			for y in ys:
+				if y != ys[0]:
+					lines.append(spacer)
+				for i, ds in enumerate(chunk(self.values, self.box)):
+					lines.append('%s | %s |' % (self.row_name(y) if i == self.box // 2 else ' ',
+						' | '.join(' '.join(self.cell_line(self.cell(x, y), i, ds) for x in xs)
+							for xs in blocks)))
+		lines.append(border)
+		return '\n'.join(lines)
+
+	def cell_line(self, cell, i, ds):
+		"""Return line i of a cell's candidates ds as shown by verbose_str."""
+		if cell.solved():
+			value = ('(%s)' if self.box > 2 else '%s') % cell.symbol()
+			return value.center(self.box) if i == self.box // 2 else ' ' * self.box
+		return ''.join(cell.dcs.get(d, Color.NEITHER).colored(Cell.SYMBOLS[d-1])
+			if d in cell.ds else '.' for d in ds)
 
 	def verify(self):
 		verified = True
-		values = set(Cell.VALUES)
-		for i in range(9):
+		values = set(self.values)
+		for i in range(self.size):
 			verified &= union(c.ds for c in self.row(i)) == values
 			verified &= union(c.ds for c in self.col(i)) == values
 			verified &= union(c.ds for c in self.block(i)) == values
-		for y, x in product(range(9), range(9)):
+		for y, x in product(range(self.size), range(self.size)):
 			cell = self.cell(x, y)
-			verified &= 1 <= len(cell.ds) <= 9 and cell.ds.issubset(values)
+			verified &= 1 <= len(cell.ds) <= self.size and cell.ds.issubset(values)
 		if not verified:
 			raise RuntimeError('Sudoku board is in an invalid state')
 
 	def copy(self):
-		return Sudoku(*self.cm)
+		sudoku = Sudoku(*self.cm)
+		sudoku.exhaustive = self.exhaustive
+		sudoku.unique = self.unique
+		return sudoku
 
 	def cells(self):
-		return flatten(self.cm)
+		return self.cell_list
+
+	def cell_index(self, cell):
+		return cell.y * self.size + cell.x
+
+	def cells_in(self, mask):
+		"""Return the cells whose indexes are set in a bitmask."""
+		return [self.cell_list[i] for i in bitmask_values(mask)]
+
+	def cells_with_candidates(self, ds):
+		"""Return a bitmask of the cells whose candidates are exactly the given
+		two or three."""
+		return self.cells_by_candidates.get(bitmask(ds), 0)
 
 	def row(self, y):
 		return self.cm[y]
@@ -155,13 +323,15 @@ J | %s%s%s %s%s%s %s%s%s | %s%s%s %s%s%s %s%s%s | %s%s%s %s%s%s %s%s%s |
 		return [row[x] for i, row in enumerate(self.cm) if i != y]
 
 	def block(self, i):
-		y, x = divmod(i, 3)
-		return list(flatten(self.cm[3*y+i][3*x:3*x+3] for i in range(3)))
+		y, x = divmod(i, self.box)
+		n = self.box
+		return list(flatten(self.cm[n*y+i][n*x:n*x+n] for i in range(n)))
 
 	def block_without(self, x, y):
-		bx3, by3 = x // 3 * 3, y // 3 * 3
-		return list(self.cm[by3+i][bx3+j] for i in range(3) for j in range(3)
-			if by3+i != y or bx3+j != x)
+		n = self.box
+		bxn, byn = x // n * n, y // n * n
+		return list(self.cm[byn+i][bxn+j] for i in range(n) for j in range(n)
+			if byn+i != y or bxn+j != x)
 
 	def unit(self, unit_type, i):
 		units = {
@@ -177,14 +347,48 @@ J | %s%s%s %s%s%s %s%s%s | %s%s%s %s%s%s %s%s%s | %s%s%s %s%s%s %s%s%s |
 			'block': self.block_without}
 		return units_without[unit_type](x, y)
 
+	def unit_positions(self, cell):
+		"""Return the index of each unit containing a cell, and the cell's
+		position in it."""
+		n = self.box
+		return ((cell.y, cell.x), (self.size + cell.x, cell.y),
+			(2 * self.size + cell.b, cell.y % n * n + cell.x % n))
+
+	def unit_locations(self, unit_type, i):
+		"""Return the positions of each candidate in a unit, as bitmasks indexed
+		by candidate."""
+		offsets = {'row': 0, 'column': self.size, 'block': 2 * self.size}
+		return self.locations[offsets[unit_type] + i]
+
+	def candidates_removed(self, cell, ds):
+		"""Update the candidate indexes after removing candidates from a cell,
+		and raise a Contradiction if a unit is left without any place for a
+		candidate or with two cells solved as the same value."""
+		for u, p in self.unit_positions(cell):
+			locations = self.locations[u]
+			for d in ds:
+				locations[d] &= ~(1 << p)
+				if not locations[d]:
+					raise Contradiction('%s has no place left for %d' % (self.unit_title(u), d))
+			if cell.solved():
+				if self.solved_values[u] & cell.mask:
+					raise Contradiction('%s has more than one %d' % (self.unit_title(u), cell.value()))
+				self.solved_values[u] |= cell.mask
+				self.solved_positions[u] |= 1 << p
+		bit = 1 << self.cell_index(cell)
+		for d in ds:
+			self.candidate_cells[d] &= ~bit
+		old_mask = cell.mask | bitmask(ds)
+		if popcount(old_mask) in [2, 3]:
+			self.cells_by_candidates[old_mask] &= ~bit
+		if len(cell.ds) in [2, 3]:
+			self.cells_by_candidates[cell.mask] = self.cells_by_candidates.get(cell.mask, 0) | bit
+
 	def seen_from(self, x, y):
-		row = self.row_without(x, y)
-		col = self.col_without(x, y)
-		block = self.block_without(x, y)
-		return set(row + col + block)
+		return set(self.peer_lists[y * self.size + x])
 
 	def cell_block(self, x, y):
-		return self.block(y // 3 * 3 + x // 3)
+		return self.block(y // self.box * self.box + x // self.box)
 
 	def cell(self, x, y):
 		return self.cm[y][x]
@@ -205,6 +409,12 @@ J | %s%s%s %s%s%s %s%s%s | %s%s%s %s%s%s %s%s%s | %s%s%s %s%s%s %s%s%s |
 			'block': self.block_name}
 		return unit_names[unit_type](i)
 
+	def unit_title(self, u):
+		"""Return the type and name of a unit given its index in the candidate
+		indexes (rows, then columns, then blocks)."""
+		unit_type = Sudoku.UNIT_TYPES[u // self.size]
+		return '%s %s' % (unit_type.capitalize(), self.unit_name(unit_type, u % self.size))
+
 	def solved(self):
 		return all(c.solved() for c in self.cells())
 
@@ -218,11 +428,7 @@ J | %s%s%s %s%s%s %s%s%s | %s%s%s %s%s%s %s%s%s | %s%s%s %s%s%s %s%s%s |
 		if verbose:
 			print('Solving:', self.code_str())
 		num_solved = self.num_solved()
-		difficulty = 0
-		last_difficulty = -1
-		while last_difficulty:
-			last_difficulty = self._solve_strategies(max_difficulty, exclude, include_only, verbose)
-			difficulty = max(difficulty, last_difficulty)
+		difficulty = max([0] + list(self.solve_iter(max_difficulty, exclude, include_only, verbose)))
 		if verbose:
 			print('Completely solved!' if self.solved() else '...Cannot solve further',
 				'(solved %d cells)' % (self.num_solved() - num_solved))
@@ -231,15 +437,72 @@ J | %s%s%s %s%s%s %s%s%s | %s%s%s %s%s%s %s%s%s | %s%s%s %s%s%s %s%s%s |
 			print(self)
 		return self.strategies[difficulty].name
 
+	def solve_iter(self, max_difficulty=None, exclude=None, include_only=None, verbose=False):
+		"""Try to solve any unsolved cells with all registered strategies, yielding
+		the difficulty of each strategy as soon as it makes progress."""
+		difficulty = self._solve_strategies(max_difficulty, exclude, include_only, verbose)
+		while difficulty:
+			yield difficulty
+			difficulty = self._solve_strategies(max_difficulty, exclude, include_only, verbose)
+
+	def steps(self, max_difficulty=None, exclude=None, include_only=None):
+		"""Try to solve any unsolved cells with all registered strategies, yielding
+		a Step for each deduction as soon as it is made.
+
+		Each strategy stops at its first deduction, so stopping after the first
+		step leaves the board with only that deduction applied, and a hint costs
+		no more than finding it."""
+		while not self.solved():
+			for difficulty, strategy in self.strategies_for(max_difficulty, exclude, include_only):
+				masks = [c.mask for c in self.cell_list]
+				self.stepping = True
+				try:
+					changed, cells = strategy.function(self, False), None
+				except StepTaken as step:
+					changed, cells = True, step.cells
+				finally:
+					self.stepping = False
+				if changed:
+					yield self._step(difficulty, strategy.name, masks, cells)
+					break
+			else:
+				return
+
+	def _step(self, difficulty, name, masks, cells):
+		"""Return the Step that changed the cells from the given masks, deduced
+		from the given cells (or from the changed ones, for a strategy that did
+		not report its pattern)."""
+		eliminations, placements, changed_cells = [], [], []
+		for cell, mask in zip(self.cell_list, masks):
+			if cell.mask == mask:
+				continue
+			changed_cells.append(cell)
+			eliminations.extend((cell.cell_name(), d) for d in bitmask_values(mask & ~cell.mask))
+			if cell.solved():
+				placements.append((cell.cell_name(), cell.value()))
+		return Step(difficulty, name, eliminations, placements,
+			[c.cell_name() for c in (changed_cells if cells is None else cells)])
+
+	def deduced(self, cells):
+		"""Note that a strategy has made one deduction from the pattern in the
+		given cells, after changing the candidates it rules out. While the steps
+		method is taking a step, stop the strategy there."""
+		if self.stepping:
+			raise StepTaken(cells)
+
+	def strategies_for(self, max_difficulty=None, exclude=None, include_only=None):
+		"""Return the registered strategies allowed by the given limits, as
+		(difficulty, strategy) pairs in order of increasing difficulty."""
+		return [(difficulty, strategy) for difficulty, strategy in sorted(self.strategies.items())
+			if not ((max_difficulty is not None and difficulty > max_difficulty) or
+				(exclude is not None and difficulty in exclude) or
+				(include_only is not None and difficulty not in include_only))]
+
 	def _solve_strategies(self, max_difficulty=None, exclude=None, include_only=None, verbose=False):
 		"""Try all registered strategies in order of increasing difficulty."""
 		if self.solved():
 			return 0
-		for difficulty, strategy in sorted(self.strategies.items()):
-			if ((max_difficulty is not None and difficulty > max_difficulty) or
-				(exclude is not None and difficulty in exclude) or
-				(include_only is not None and difficulty not in include_only)):
-				continue
+		for difficulty, strategy in self.strategies_for(max_difficulty, exclude, include_only):
 			if strategy.function(self, verbose):
 				return difficulty
 		return 0
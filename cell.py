@@ -3,27 +3,59 @@ from __future__ import print_function
 from utils import *
 from color import *
 
+# The colors of every uncolored cell's candidates, shared so that only colored
+# cells need their own dictionary (it must never be modified)
+NO_COLORS = {}
+
+class Contradiction(RuntimeError):
+	"""Raised as soon as removing candidates leaves a board in an invalid state."""
+
 class Cell(object):
-	"""A cell on a 9x9 Sudoku board."""
+	"""A cell on an NxN Sudoku board."""
 
 	VALUES = range(1, 10)
-	ROWS = 'ABCDEFGHJ'
-	COLS = '123456789'
-	BLOCKS = '123456789'
-
-	def __init__(self, x, y, ds=None):
+	ROWS = 'ABCDEFGHJKLMNOPQRSTUVWXYZ'
+	COLS = [str(i) for i in range(1, 26)]
+	BLOCKS = COLS
+	SYMBOLS = '123456789ABCDEFGHIJKLMNOP'
+
+	# The board a cell belongs to is only weakly referenced, so that boards
+	# and their cells do not form reference cycles that only the garbage
+	# collector can free
+	__slots__ = ('x', 'y', 'b', 'ds', 'mask', 'dcs', 'sudoku_ref')
+
+	def __init__(self, x, y, ds=None, size=9):
+		box = int(round(size ** 0.5))
 		self.x = x
 		self.y = y
-		self.b = y // 3 * 3 + x // 3
+		self.b = y // box * box + x // box
 		if isinstance(ds, Cell):
 			self.ds = set(ds.ds)
 		elif isinstance(ds, (list, tuple, set)):
 			self.ds = set(ds)
-		elif ds in Cell.VALUES or ds in map(str, Cell.VALUES):
-			self.ds = {int(ds)}
+		elif ds in range(1, size + 1):
+			self.ds = {ds}
+		elif ds in list(Cell.SYMBOLS[:size]):
+			self.ds = {Cell.SYMBOLS.index(ds) + 1}
 		else:
-			self.ds = set(Cell.VALUES)
-		self.dcs = {}
+			self.ds = set(range(1, size + 1))
+		self.mask = bitmask(self.ds)
+		self.dcs = NO_COLORS
+		self.sudoku_ref = None
+
+	@classmethod
+	def from_mask(cls, x, y, mask, size=9):
+		"""Return a cell with the candidates in a bitmask, without parsing them."""
+		box = int(round(size ** 0.5))
+		cell = cls.__new__(cls)
+		cell.x = x
+		cell.y = y
+		cell.b = y // box * box + x // box
+		cell.ds = set(bitmask_values(mask))
+		cell.mask = mask
+		cell.dcs = NO_COLORS
+		cell.sudoku_ref = None
+		return cell
 
 	def __str__(self):
 		return '%s = {%s}' % (self.cell_name(),
@@ -53,7 +85,7 @@ class Cell(object):
 		return unit_names[unit_type]()
 
 	def cell_name(self):
-		return self.row_name() + self.col_name()
+		return Cell.NAMES[self.y][self.x]
 
 	def solved(self):
 		return len(self.ds) == 1
@@ -62,19 +94,49 @@ class Cell(object):
 		return len(self.ds) == 2
 
 	def value(self):
-		return list(self.ds)[0] if self.solved() else '.'
+		return self.mask.bit_length() - 1 if self.solved() else '.'
+
+	def symbol(self):
+		return Cell.SYMBOLS[self.value() - 1] if self.solved() else '.'
 
 	def value_string(self):
 		return str(self.value()) if self.solved() else set_string(self.ds)
 
+	def add_color(self, d, color):
+		"""Mix a color into the color of a candidate."""
+		if self.dcs is NO_COLORS:
+			self.dcs = {}
+		self.dcs[d] = self.dcs.get(d, Color.NEITHER) | color
+
+	def clear_colors(self):
+		"""Remove the colors of all candidates."""
+		self.dcs = NO_COLORS
+
 	def exclude(self, ds):
 		"""Exclude the given candidates and return whether any were eliminated."""
-		n = len(self.ds)
-		self.ds -= set(ds)
-		return len(self.ds) < n
+		return self._remove(self.ds & set(ds))
 
 	def include_only(self, ds):
 		"""Include only the given candidates and return whether any were eliminated."""
-		n = len(self.ds)
-		self.ds &= set(ds)
-		return len(self.ds) < n
+		return self._remove(self.ds - set(ds))
+
+	def _remove(self, ds):
+		"""Remove the given subset of candidates and return whether it was nonempty."""
+		if not ds:
+			return False
+		if len(ds) == len(self.ds):
+			raise Contradiction('Cell %s has no candidates left' % self.cell_name())
+		self.ds -= ds
+		self.mask = bitmask(self.ds)
+		sudoku = self.sudoku()
+		if sudoku is not None:
+			sudoku.candidates_removed(self, ds)
+		return True
+
+	def sudoku(self):
+		"""Return the board this cell belongs to, or None if it has none (or
+		that board no longer exists)."""
+		return self.sudoku_ref() if self.sudoku_ref is not None else None
+
+# The name of each cell, indexed by row and column
+Cell.NAMES = [[row + col for col in Cell.COLS] for row in Cell.ROWS]
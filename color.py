@@ -20,9 +20,11 @@ class Color(object):
 	def __str__(self):
 		return self.colored(self.name)
 
-	def __nonzero__(self):
+	def __bool__(self):
 		return bool(self.value)
 
+	__nonzero__ = __bool__
+
 	def __invert__(self):
 		return Color.colors[~self.value]
 
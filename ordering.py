@@ -0,0 +1,88 @@
+from __future__ import print_function
+
+from board import Sudoku
+from strategies import *
+
+from parallel import init_worker
+
+from multiprocessing import Pool
+from timeit import default_timer
+
+# The cost of a board that an earlier run could not solve
+UNSOLVED_COST = 1000
+
+# The most difficult strategy to use on every board before ordering them
+ESTIMATE_DIFFICULTY = 9
+
+def start_solving(task):
+	"""Solve a board given as text with strategies up to ESTIMATE_DIFFICULTY,
+	and return how many candidates it has left, as an estimate of how long the
+	rest will take; and the state that solve_line can pick up from."""
+	line, exhaustive = task
+	start = default_timer()
+	board = Sudoku(line)
+	board.exhaustive = exhaustive
+	n = board.num_solved()
+	try:
+		difficulty = max([0] + list(board.solve_iter(ESTIMATE_DIFFICULTY)))
+	except RuntimeError:
+		# Solving it from the start will run into the same error
+		return 0, None
+	cost = sum(len(c.ds) for c in board.cells() if not c.solved())
+	return cost, (board.to_bytes(), difficulty, n, default_timer() - start)
+
+def solve_line(task):
+	"""Solve a board given as text, or from the state left by start_solving,
+	and return its result (or an error) and how long it took in all."""
+	line, state, guess, exhaustive = task
+	start = default_timer()
+	if state:
+		data, difficulty, n, seconds = state
+		board = Sudoku.from_bytes(data)
+	else:
+		board = Sudoku(line)
+		difficulty, n, seconds = 0, board.num_solved(), 0
+	board.exhaustive = exhaustive
+	try:
+		difficulty = max([difficulty] + list(board.solve_iter(exclude=None if guess else [999])))
+		board.verify()
+	except RuntimeError as e:
+		return None, str(e), seconds + default_timer() - start
+	return ({'solved_cells': board.num_solved() - n, 'solved': board.solved(),
+		'board': line, 'strategy': Sudoku.strategies[difficulty].name}, None,
+		seconds + default_timer() - start)
+
+def solve_longest_first(lines, guess=False, exhaustive=False, workers=None, costs=None):
+	"""Solve boards given as text with a pool of worker processes, starting
+	with the ones that should take longest, and yield each one's text, result
+	(or error), and solving time in their original order.
+
+	costs maps boards to their cost from an earlier run: the difficulty of the
+	hardest strategy used, or UNSOLVED_COST. Other boards are started first to
+	estimate their cost, and go before all of those, since less is known about
+	them. Solving the hardest boards first keeps a few of them from holding up
+	the end of a batch while the other workers are idle."""
+	costs = costs or {}
+	pool = Pool(workers, init_worker)
+	try:
+		unknown = [i for i, line in enumerate(lines) if line not in costs]
+		started = dict(zip(unknown, pool.map(start_solving,
+			[(lines[i], exhaustive) for i in unknown], 16)))
+		order = sorted(range(len(lines)), key=lambda i: (i in started,
+			started[i][0] if i in started else costs[lines[i]]), reverse=True)
+		tasks = [(i, (lines[i], started[i][1] if i in started else None, guess, exhaustive))
+			for i in order]
+		results = {}
+		next_i = 0
+		for i, result in pool.imap_unordered(solve_indexed_line, tasks):
+			results[i] = result
+			while next_i in results:
+				result, error, seconds = results.pop(next_i)
+				yield lines[next_i], result, error, seconds
+				next_i += 1
+	finally:
+		pool.terminate()
+
+def solve_indexed_line(task):
+	i, task = task
+	return i, solve_line(task)
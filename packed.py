@@ -0,0 +1,170 @@
+from __future__ import print_function
+
+from cell import *
+from board import Sudoku
+
+from contextlib import closing
+import mmap
+
+# Every packed board file starts with this, then the size of its boards and a
+# newline (so files of 9x9 boards start with b'SUDOKU9\n')
+MAGIC = b'SUDOKU'
+
+# The symbol for each possible digit in the text form of a board
+DIGIT_SYMBOLS = '0' + Cell.SYMBOLS
+
+# The high and low nibble of each possible byte
+NIBBLES = [(b >> 4, b & 15) for b in range(256)]
+
+# Cell contents for each possible digit on boards of each size, in a form Cell
+# accepts directly
+_cell_values = {}
+
+def header(size):
+	"""Return the header of a packed file of boards of the given size."""
+	return MAGIC + str(size).encode('ascii') + b'\n'
+
+def record_size(size):
+	"""Return how many bytes a board of the given size is packed into: its
+	digits (0 for unsolved), two per byte if they fit in a nibble, or else one
+	per byte."""
+	return (size * size + 1) // 2 if size < 16 else size * size
+
+def is_packed(filename):
+	"""Return whether a file contains packed boards."""
+	with open(filename, 'rb') as file:
+		return file.read(len(MAGIC)) == MAGIC
+
+def board_digits(line):
+	"""Return the digits of a text board (0 for unsolved) and its size."""
+	digits = [DIGIT_SYMBOLS.find(c) if c in DIGIT_SYMBOLS else 0
+		for c in line if c in DIGIT_SYMBOLS or c in '._*']
+	size = int(round(len(digits) ** 0.5))
+	box = int(round(size ** 0.5))
+	if box < 2 or box ** 4 != len(digits) or size > len(Cell.SYMBOLS):
+		raise ValueError('Invalid Sudoku board: %r' % (line,))
+	# Sudoku leaves cells with symbols beyond its size unsolved too
+	return [d if d <= size else 0 for d in digits], size
+
+def digits_line(digits):
+	"""Return the text form of a board's digits, with 0 for unsolved cells."""
+	return ''.join(DIGIT_SYMBOLS[d] for d in digits)
+
+def digits_board(digits):
+	"""Return a board with the given digits, without parsing any text."""
+	size = int(round(len(digits) ** 0.5))
+	if size not in _cell_values:
+		values = tuple(range(1, size + 1))
+		_cell_values[size] = [values] + [(d,) for d in values]
+	cell_values = _cell_values[size]
+	return Sudoku([cell_values[d] for d in digits])
+
+def pack_digits(digits, size):
+	"""Pack the digits of a board of the given size into bytes."""
+	if size >= 16:
+		return bytes(bytearray(digits))
+	digits = digits + [0] * (len(digits) % 2)
+	return bytes(bytearray(hi << 4 | lo for hi, lo in zip(digits[::2], digits[1::2])))
+
+def pack_boards(text_filename, packed_filename):
+	"""Convert a text file of boards into a packed file. Return how many boards
+	it contains, and the text and error of each line that could not be packed.
+
+	Every board in a packed file is the same size as the first one."""
+	n = 0
+	size = None
+	errors = []
+	with open(text_filename, 'r') as boards, open(packed_filename, 'wb') as packed:
+		for line in boards:
+			line = line.strip()
+			if not line or line.startswith('#'):
+				continue
+			try:
+				digits, board_size = board_digits(line)
+				if size is None:
+					size = board_size
+					packed.write(header(size))
+				elif board_size != size:
+					raise ValueError('Sudoku board is %dx%d, not %dx%d like the first one' %
+						(board_size, board_size, size, size))
+			except ValueError as e:
+				errors.append((line, str(e)))
+				continue
+			packed.write(pack_digits(digits, size))
+			n += 1
+		if size is None:
+			packed.write(header(9))
+	return n, errors
+
+class PackedBoards(object):
+	"""A memory-mapped file of packed boards, indexed by their order in the file.
+
+	Boards are unpacked directly into cells without any string parsing, and
+	any slice of boards can be read without reading the ones before it."""
+
+	def __init__(self, filename):
+		with open(filename, 'rb') as file:
+			self.mm = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+		end = self.mm.find(b'\n', 0, len(MAGIC) + 3)
+		size = self.mm[len(MAGIC):end]
+		self.size = int(size) if end > 0 and size.isdigit() else 0
+		box = int(round(self.size ** 0.5))
+		self.header_size = end + 1
+		self.record_size = record_size(self.size)
+		if (self.mm[:len(MAGIC)] != MAGIC or box < 2 or box * box != self.size or
+			self.size > len(Cell.SYMBOLS) or (len(self.mm) - self.header_size) % self.record_size):
+			self.mm.close()
+			raise ValueError('Invalid packed board file: %r' % (filename,))
+
+	def __len__(self):
+		return (len(self.mm) - self.header_size) // self.record_size
+
+	def __getitem__(self, i):
+		if not -len(self) <= i < len(self):
+			raise IndexError('packed board index out of range')
+		return next(self.boards(i % len(self), i % len(self) + 1))
+
+	def __iter__(self):
+		return self.boards()
+
+	def close(self):
+		self.mm.close()
+
+	def shard(self, shard=None):
+		"""Return the start and stop indexes of shard k of n (numbered from 1)
+		if shard is given as (k, n), or else of the whole file."""
+		if not shard:
+			return 0, len(self)
+		k, n = shard
+		return len(self) * (k - 1) // n, len(self) * k // n
+
+	def records(self, start=0, stop=None):
+		"""Yield the digits (0 for unsolved) of the boards from index start up
+		to (but not including) stop."""
+		stop = len(self) if stop is None else min(stop, len(self))
+		num_cells = self.size * self.size
+		for i in range(start, stop):
+			offset = self.header_size + i * self.record_size
+			record = bytearray(self.mm[offset:offset+self.record_size])
+			if self.size >= 16:
+				yield list(record)
+			else:
+				yield [d for b in record for d in NIBBLES[b]][:num_cells]
+
+	def boards(self, start=0, stop=None):
+		"""Yield the boards from index start up to (but not including) stop."""
+		for digits in self.records(start, stop):
+			yield digits_board(digits)
+
+def read_packed_records(filename, shard=None):
+	"""Yield the digits of each board in a packed file, or only those in shard
+	k of n (numbered from 1) if shard is given as (k, n)."""
+	with closing(PackedBoards(filename)) as boards:
+		for digits in boards.records(*boards.shard(shard)):
+			yield digits
+
+def read_packed_boards(filename, shard=None):
+	"""Yield each board in a packed file with its text form, or only those in
+	shard k of n as read_packed_records does."""
+	for digits in read_packed_records(filename, shard):
+		yield digits_line(digits), digits_board(digits)
@@ -0,0 +1,70 @@
+from __future__ import print_function
+
+from board import Sudoku
+from strategies import *
+
+from multiprocessing import Pool
+import signal
+
+# The board last tried in this worker process, and the state it was made from
+_snapshot = [None, None]
+
+def init_worker():
+	"""Leave handling Ctrl-C to the parent process, and keep strategies run in
+	a worker from using the pool themselves."""
+	signal.signal(signal.SIGINT, signal.SIG_IGN)
+	Sudoku.pool = None
+
+def call_on_snapshot(task):
+	"""Call a function with a board and the given arguments, reusing the last
+	board in this process if it is still the same."""
+	function, state, args = task
+	if _snapshot[0] != state:
+		data, exhaustive, unique = state
+		board = Sudoku.from_bytes(data)
+		# Settings made on the board itself are not part of its bytes
+		board.exhaustive = exhaustive
+		board.unique = unique
+		_snapshot[:] = [state, board]
+	try:
+		result = function(_snapshot[1], *args)
+	except RuntimeError:
+		# Let the parent run into the same contradiction
+		result = True
+	if result:
+		# The function may have made progress on the board
+		_snapshot[:] = [None, None]
+	return result
+
+class StartPool(object):
+	"""A pool of worker processes that try a strategy from many starting
+	points (or many guesses) at once, each on its own copy of a board.
+
+	They are tried in batches of a few per worker, so that little work is
+	wasted past the first one that makes progress."""
+
+	def __init__(self, processes):
+		self.pool = Pool(processes, init_worker)
+		self.batch_size = 2 * processes
+
+	def map(self, sudoku, function, args):
+		"""Yield the result of calling a function with a copy of a board and each
+		of the given tuples of arguments, in order. Results are computed a batch
+		at a time, so no more are computed than are asked for, give or take one
+		batch."""
+		state = (sudoku.to_bytes(), sudoku.exhaustive, sudoku.unique)
+		for i in range(0, len(args), self.batch_size):
+			batch = args[i:i+self.batch_size]
+			for result in self.pool.map(call_on_snapshot, [(function, state, a) for a in batch], 1):
+				yield result
+
+	def first(self, sudoku, solve_from, starts):
+		"""Return the index of the first starting point from which a strategy
+		makes progress on a board, or None if there is none."""
+		for i, changed in enumerate(self.map(sudoku, solve_from, [s + (False,) for s in starts])):
+			if changed:
+				return i
+		return None
+
+	def close(self):
+		self.pool.terminate()
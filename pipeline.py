@@ -0,0 +1,91 @@
+from __future__ import print_function
+
+from board import Sudoku
+from strategies import *
+
+from parallel import init_worker
+
+from multiprocessing import Pool
+from threading import Condition
+
+# Each tier of the pipeline, with the most difficult strategy it may use
+TIERS = [
+	('singles, subsets and intersections', 9),
+	('wings, fish and Medusas', 16),
+	('forcing chains and subset exclusion', 22),
+	('guessing', 999),
+]
+
+def solve_tier(line, state, max_difficulty):
+	"""Solve a board, given as text or as the state left by an earlier tier,
+	with strategies up to max_difficulty. Return its new state, the difficulty
+	of the most advanced strategy used, whether it was solved, and how many of
+	its cells are solved; or an error."""
+	try:
+		board = Sudoku.from_bytes(state) if state is not None else Sudoku(line)
+		exclude = None if max_difficulty >= 999 else [999]
+		difficulty = max([0] + list(board.solve_iter(max_difficulty, exclude)))
+		board.verify()
+	except RuntimeError as e:
+		return None, 0, False, 0, str(e)
+	return board.to_bytes(), difficulty, board.solved(), board.num_solved(), None
+
+class Pipeline(object):
+	"""Solve boards in tiers of increasingly advanced strategies, each with
+	its own pool of worker processes and its own queue.
+
+	A board leaves the pipeline as soon as a tier solves it, or after the last
+	tier, so boards that only need easy strategies never wait behind ones
+	that need forcing chains. A board passes its partly solved state on to the
+	next tier, which picks up where the last one stopped; so the results are
+	the same as solving each board in one go."""
+
+	def __init__(self, report, guess=False, workers=None):
+		self.report = report
+		self.tiers = TIERS if guess else TIERS[:-1]
+		self.pools = [Pool(workers, init_worker) for _ in self.tiers]
+		self.exits = [0 for _ in self.tiers]
+		self.pending = 0
+		self.done = Condition()
+
+	def submit(self, line, num_solved):
+		"""Start solving a board given as text, with num_solved cells solved."""
+		with self.done:
+			self.pending += 1
+		self._submit(0, line, None, num_solved, 0)
+
+	def _submit(self, tier, line, state, num_solved, difficulty):
+		callback = lambda result: self._finish_tier(tier, line, num_solved, difficulty, result)
+		self.pools[tier].apply_async(solve_tier, (line, state, self.tiers[tier][1]),
+			callback=callback)
+
+	def _finish_tier(self, tier, line, num_solved, difficulty, result):
+		state, tier_difficulty, solved, now_solved, error = result
+		difficulty = max(difficulty, tier_difficulty)
+		if not error and not solved and tier + 1 < len(self.tiers):
+			self._submit(tier + 1, line, state, num_solved, difficulty)
+			return
+		with self.done:
+			self.exits[tier] += 1
+			if error:
+				self.report(line, None, error)
+			else:
+				self.report(line, {'solved_cells': now_solved - num_solved,
+					'solved': solved, 'board': line,
+					'strategy': Sudoku.strategies[difficulty].name}, None)
+			self.pending -= 1
+			self.done.notify_all()
+
+	def join(self):
+		"""Wait for every board to leave the pipeline, and shut it down."""
+		with self.done:
+			while self.pending:
+				self.done.wait(1)
+		for pool in self.pools:
+			pool.close()
+			pool.join()
+
+	def tier_exits(self):
+		"""Return the name of each tier and how many boards left the pipeline
+		after it."""
+		return [(name, n) for (name, _), n in zip(self.tiers, self.exits)]
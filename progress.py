@@ -0,0 +1,88 @@
+from __future__ import print_function
+
+from board import Sudoku
+
+from array import array
+from collections import Counter, deque
+from timeit import default_timer
+import sys
+
+def percentile(sorted_values, p):
+	"""Return the value below which p percent of some sorted values fall."""
+	if not sorted_values:
+		return 0.0
+	return sorted_values[min(len(sorted_values) - 1, int(len(sorted_values) * p / 100.0))]
+
+def duration_string(seconds):
+	"""Return a number of seconds as H:MM:SS."""
+	minutes, seconds = divmod(int(round(seconds)), 60)
+	hours, minutes = divmod(minutes, 60)
+	return '%d:%02d:%02d' % (hours, minutes, seconds)
+
+class Progress(object):
+	"""Report how a batch of boards is going, every so often and once it is
+	done: how many boards have been solved and how fast, the latency of recent
+	boards, and which strategies were the hardest ones used.
+
+	Each board only costs a few appends, and the latencies are only sorted
+	when a report is due, so it can be left on for long runs."""
+
+	def __init__(self, total=None, interval=10.0, window=1000, file=sys.stderr):
+		self.total = total
+		self.interval = interval
+		self.file = file
+		self.start = self.last_report = default_timer()
+		self.num_boards = 0
+		self.num_solved = 0
+		# The latency of every board, and of the most recent ones
+		self.seconds = array('d')
+		self.recent = deque(maxlen=window)
+		self.strategies = Counter()
+
+	def update(self, seconds, solved, strategy):
+		"""Record one board, and report progress if it is due."""
+		self.num_boards += 1
+		self.num_solved += solved
+		self.seconds.append(seconds)
+		self.recent.append(seconds)
+		self.strategies[strategy] += 1
+		now = default_timer()
+		if self.interval and now - self.last_report >= self.interval:
+			self.last_report = now
+			self.report(now)
+
+	def report(self, now=None):
+		"""Print one line of progress."""
+		elapsed = (now or default_timer()) - self.start
+		rate = self.num_boards / elapsed if elapsed else 0.0
+		done = '%d/%d' % (self.num_boards, self.total) if self.total else str(self.num_boards)
+		eta = (duration_string((self.total - self.num_boards) / rate)
+			if self.total and rate else '?')
+		recent = sorted(self.recent)
+		print('# progress: %s boards, %.1f boards/s, ETA %s, p50 %.1f ms, p99 %.1f ms, %.1f%% solved' %
+			(done, rate, eta, percentile(recent, 50) * 1000, percentile(recent, 99) * 1000,
+				100.0 * self.num_solved / max(self.num_boards, 1)), file=self.file)
+		self.file.flush()
+
+	def summary(self, width=40):
+		"""Print the totals and a histogram of the hardest strategy used for
+		each board."""
+		elapsed = default_timer() - self.start
+		seconds = sorted(self.seconds)
+		print('# done: %d boards in %s (%.1f boards/s), %d solved (%.1f%%)' %
+			(self.num_boards, duration_string(elapsed), self.num_boards / elapsed if elapsed else 0.0,
+				self.num_solved, 100.0 * self.num_solved / max(self.num_boards, 1)), file=self.file)
+		print('# latency: p50 %.1f ms, p99 %.1f ms, max %.1f ms' %
+			(percentile(seconds, 50) * 1000, percentile(seconds, 99) * 1000,
+				(seconds[-1] if seconds else 0.0) * 1000), file=self.file)
+		print('# hardest strategy:', file=self.file)
+		most = max(self.strategies.values()) if self.strategies else 1
+		names = [s.name for _, s in sorted(Sudoku.strategies.items())]
+		names += sorted(set(self.strategies) - set(names))
+		name_width = max(len(name) for name in names)
+		for name in names:
+			n = self.strategies[name]
+			if n:
+				print('#   %s %7d %s' % (name.ljust(name_width), n,
+					'#' * max(int(round(width * n / float(most))), 1)), file=self.file)
+		self.file.flush()
@@ -0,0 +1,135 @@
+from __future__ import print_function
+
+from board import Sudoku
+from strategies import *
+
+from parallel import init_worker
+
+from multiprocessing import Pool
+from threading import Lock
+import json
+import os
+import signal
+import sys
+
+try:
+	import socketserver
+except ImportError:
+	import SocketServer as socketserver
+
+try:
+	from cStringIO import StringIO
+except ImportError:
+	from io import StringIO
+
+def solve_request(request, guess=False):
+	"""Solve the board in a request and return a result to send back.
+
+	A request is a dictionary with a "board" and optional "id", "guess",
+	"max_difficulty", "explain", and "hint" entries. The result echoes the "id"
+	and reports whether the board was solved, its final state, and the most
+	advanced strategy used (or an "error"). With "explain" on, the steps that
+	would be printed by "./sudoku.py BOARD" are included as "explanation". With
+	"hint" on, only the next step is taken, and included as "step"."""
+	result = {'id': request.get('id')}
+	try:
+		board = Sudoku(str(request['board']))
+	except (KeyError, ValueError):
+		result['error'] = 'invalid board: %r' % request.get('board')
+		return result
+	max_difficulty = request.get('max_difficulty')
+	if max_difficulty is not None and (isinstance(max_difficulty, bool) or
+			not isinstance(max_difficulty, (int, float))):
+		result['error'] = 'invalid max_difficulty: %r' % (max_difficulty,)
+		return result
+	exclude = None if request.get('guess', guess) else [999]
+	explain = bool(request.get('explain'))
+	stdout = sys.stdout
+	if explain:
+		sys.stdout = StringIO()
+	try:
+		if request.get('hint'):
+			step = next(board.steps(max_difficulty, exclude), None)
+			result['step'] = dict(step._asdict()) if step else None
+			result['strategy'] = step.strategy if step else Sudoku.strategies[0].name
+		else:
+			result['strategy'] = board.solve(max_difficulty=max_difficulty,
+				exclude=exclude, verbose=explain)
+		board.verify()
+		result['solved'] = board.solved()
+		result['board'] = board.code_str()
+	except RuntimeError as e:
+		result['error'] = str(e)
+	except Exception as e:
+		# Any other error would keep the result from ever being sent back
+		result['error'] = 'invalid request: %s' % e
+	finally:
+		if explain:
+			result['explanation'] = sys.stdout.getvalue()
+			sys.stdout = stdout
+	return result
+
+class SolverHandler(socketserver.StreamRequestHandler):
+	"""Read newline-delimited JSON requests from a connection and stream back
+	newline-delimited JSON results as soon as they are solved."""
+
+	def handle(self):
+		lock = Lock()
+		def send(result):
+			with lock:
+				try:
+					self.wfile.write((json.dumps(result) + '\n').encode('utf-8'))
+					self.wfile.flush()
+				except (IOError, OSError):
+					pass
+		pending = []
+		for line in self.rfile:
+			line = line.strip()
+			if not line:
+				continue
+			try:
+				request = json.loads(line.decode('utf-8'))
+				if not isinstance(request, dict):
+					raise ValueError('request is not an object')
+			except ValueError as e:
+				send({'id': None, 'error': 'invalid request: %s' % e})
+				continue
+			pending.append(self.server.pool.apply_async(solve_request,
+				(request, self.server.guess), callback=send))
+		for result in pending:
+			result.wait()
+
+class TCPSolverServer(socketserver.ThreadingMixIn, socketserver.TCPServer):
+	daemon_threads = True
+	allow_reuse_address = True
+
+class UnixSolverServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+	daemon_threads = True
+
+def stop_serving(signum, frame):
+	"""Stop serving on SIGTERM the same way as on Ctrl-C."""
+	raise KeyboardInterrupt
+
+def serve(address, workers=None, guess=False):
+	"""Serve solve requests on a Unix socket path or a TCP "[host:]port"
+	address until interrupted, dispatching them to a pool of workers."""
+	host, _, port = address.rpartition(':')
+	if port.isdigit():
+		server = TCPSolverServer((host or '127.0.0.1', int(port)), SolverHandler)
+	else:
+		if os.path.exists(address):
+			os.unlink(address)
+		server = UnixSolverServer(address, SolverHandler)
+	server.pool = Pool(workers, init_worker)
+	server.guess = guess
+	# Clean up the socket when stopped by a service manager too
+	signal.signal(signal.SIGTERM, stop_serving)
+	try:
+		server.serve_forever()
+	except KeyboardInterrupt:
+		pass
+	finally:
+		server.server_close()
+		server.pool.terminate()
+		if isinstance(server, UnixSolverServer):
+			os.unlink(address)
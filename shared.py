@@ -0,0 +1,243 @@
+from __future__ import print_function
+
+from board import Sudoku
+from strategies import *
+
+from ordering import ESTIMATE_DIFFICULTY, solve_line
+from packed import PackedBoards, board_digits, digits_line
+from parallel import init_worker
+
+from binascii import unhexlify
+from contextlib import closing
+from itertools import islice
+from multiprocessing import Pool, Queue, Value, cpu_count
+from timeit import default_timer
+import struct
+
+try:
+	from multiprocessing import shared_memory
+except ImportError:
+	shared_memory = None
+
+try:
+	from queue import Empty
+except ImportError:
+	from Queue import Empty
+
+# The state of a board in a block: not started, partly solved (up to
+# ESTIMATE_DIFFICULTY), done, or stopped by an error
+NEW, STARTED, DONE, ERROR = range(4)
+
+# Each board's record in a block: its state, whether it is solved, the index
+# of the hardest strategy used so far (in order of difficulty), how many cells
+# were solved to begin with and how many are solved now, its estimated cost,
+# and the seconds spent solving it so far; followed by its candidates as
+# packed by Sudoku.to_bytes
+RECORD = struct.Struct('<BBHHHHd')
+
+# How many boards are loaded into the block of shared memory at a time
+CHUNK_SIZE = 4096
+
+# The next position in a block's order of boards for a worker to take, shared
+# by all the workers in a pool
+_next = None
+
+# A queue of the indexes of the boards that workers have finished solving
+_done = None
+
+def grid_length(box):
+	"""Return how many bytes Sudoku.to_bytes packs a board with this box size into."""
+	return 1 + (box ** 6 + 7) // 8
+
+def pack_digits(digits, size):
+	"""Pack the candidates of a board given as digits (0 for unsolved) as
+	Sudoku.to_bytes does, without building the board, and return them with how
+	many cells are given."""
+	full = (1 << size) - 1
+	packed = given = 0
+	for d in reversed(digits):
+		packed = packed << size | (1 << (d - 1) if d else full)
+		given += d > 0
+	box = int(round(size ** 0.5))
+	length = grid_length(box) - 1
+	return bytes(bytearray([box])) + unhexlify('%0*x' % (2 * length, packed)), given
+
+def pack_line(line):
+	"""Pack the candidates of a board given as text as pack_digits does."""
+	return pack_digits(*board_digits(line))
+
+def line_grids(lines):
+	"""Yield the text of each board, with its candidates and how many cells
+	are given as pack_line returns them, skipping any invalid boards."""
+	for line in lines:
+		try:
+			data, given = pack_line(line)
+		except ValueError as e:
+			print('*** ERROR:', line, e)
+			continue
+		yield line, data, given
+
+def packed_grids(filename, shard=None):
+	"""Yield the text of each board in a packed file (or only those in shard k
+	of n if shard is given as (k, n)), with its candidates and how many cells
+	are given, packed straight from its digits."""
+	with closing(PackedBoards(filename)) as boards:
+		for digits in boards.records(*boards.shard(shard)):
+			data, given = pack_digits(digits, boards.size)
+			yield digits_line(digits), data, given
+
+def init_shared_worker(next_position, done):
+	global _next, _done
+	init_worker()
+	_next = next_position
+	_done = done
+
+def take_position():
+	with _next.get_lock():
+		k = _next.value
+		_next.value += 1
+	return k
+
+def solve_in_block(task):
+	"""Solve the boards of a block in its order, as long as any are left:
+	up to ESTIMATE_DIFFICULTY if only starting them, or else all the way."""
+	name, num_boards, record_size, order_offset, guess, exhaustive, starting = task
+	block = shared_memory.SharedMemory(name)
+	try:
+		difficulties = sorted(Sudoku.strategies)
+		exclude = None if guess else [999]
+		while True:
+			k = take_position()
+			if k >= num_boards:
+				break
+			i, = struct.unpack_from('<I', block.buf, order_offset + 4 * k)
+			solve_record(block, i * record_size, difficulties, exclude, exhaustive, starting)
+			if not starting:
+				_done.put(i)
+	finally:
+		block.close()
+	return True
+
+def solve_record(block, offset, difficulties, exclude, exhaustive, starting):
+	"""Solve the board in a block's record at the given offset, unless it is
+	already done, and write back its candidates and result."""
+	state, solved, hardest, given, num_solved, cost, seconds = RECORD.unpack_from(
+		block.buf, offset)
+	if state in [DONE, ERROR]:
+		return
+	start = default_timer()
+	grid = offset + RECORD.size
+	box = block.buf[grid]
+	board = Sudoku.from_bytes(bytes(block.buf[grid:grid+grid_length(box)]))
+	board.exhaustive = exhaustive
+	try:
+		if starting:
+			difficulty = max([0] + list(board.solve_iter(ESTIMATE_DIFFICULTY)))
+			cost = sum(len(c.ds) for c in board.cells() if not c.solved())
+		else:
+			difficulty = max([0] + list(board.solve_iter(exclude=exclude)))
+			board.verify()
+	except RuntimeError:
+		RECORD.pack_into(block.buf, offset, ERROR, False, hardest, given, num_solved, cost,
+			seconds)
+		return
+	data = board.to_bytes()
+	block.buf[grid:grid+len(data)] = data
+	hardest = max(hardest, difficulties.index(difficulty))
+	RECORD.pack_into(block.buf, offset, STARTED if starting else DONE, board.solved(),
+		hardest, given, board.num_solved(), cost, seconds + default_timer() - start)
+
+def solve_longest_first_shared(boards, guess=False, exhaustive=False, workers=None, costs=None):
+	"""Solve boards like solve_longest_first, but hand them to the workers and
+	get back their results through a block of shared memory instead of
+	pickling each one. boards yields the text of each board, with its
+	candidates and how many cells are given, as line_grids and packed_grids do.
+
+	Boards are loaded into the block CHUNK_SIZE at a time, and each chunk is
+	solved longest first before the next one replaces it; so the block stays
+	the same size however many boards there are. The workers take boards
+	from an order stored in the block, solve them in place, write their
+	results next to them, and put their indexes on a queue once they are
+	done."""
+	costs = costs or {}
+	boards = iter(boards)
+	next_position = Value('i', 0)
+	done = Queue()
+	block = pool = None
+	try:
+		chunk = list(islice(boards, CHUNK_SIZE))
+		while chunk:
+			record_size = RECORD.size + max(len(data) for _, data, _ in chunk)
+			# A block is only replaced if a chunk has boards of a larger size
+			block_size = CHUNK_SIZE * (record_size + 4)
+			if block is None or block.size < block_size:
+				old_block, block = block, None
+				if old_block is not None:
+					old_block.close()
+					old_block.unlink()
+				block = shared_memory.SharedMemory(create=True, size=block_size)
+			if pool is None:
+				# Workers started after the first block share this process's
+				# resource tracker, instead of each starting one that would
+				# remove the blocks they used when they are stopped
+				pool = Pool(workers, init_shared_worker, (next_position, done))
+			for solved in solve_chunk(pool, block, next_position, done, chunk, record_size,
+				guess, exhaustive, workers, costs):
+				yield solved
+			chunk = list(islice(boards, CHUNK_SIZE))
+	finally:
+		if pool is not None:
+			pool.terminate()
+		if block is not None:
+			block.close()
+			block.unlink()
+
+def solve_chunk(pool, block, next_position, done, chunk, record_size, guess, exhaustive,
+	workers, costs):
+	"""Solve a chunk of boards in a block longest first, and yield each one's
+	text, result (or error), and solving time in their order in the chunk."""
+	difficulties = sorted(Sudoku.strategies)
+	lines = [line for line, _, _ in chunk]
+	order_offset = len(chunk) * record_size
+	for i, (_, data, given) in enumerate(chunk):
+		offset = i * record_size
+		RECORD.pack_into(block.buf, offset, NEW, False, 0, given, given, 0, 0.0)
+		block.buf[offset+RECORD.size:offset+RECORD.size+len(data)] = data
+	def run(order, starting):
+		for k, i in enumerate(order):
+			struct.pack_into('<I', block.buf, order_offset + 4 * k, i)
+		next_position.value = 0
+		task = (block.name, len(order), record_size, order_offset, guess, exhaustive, starting)
+		return pool.map_async(solve_in_block, [task] * (workers or cpu_count()))
+	unknown = [i for i, line in enumerate(lines) if line not in costs]
+	run(unknown, True).get()
+	estimates = {}
+	for i in unknown:
+		estimates[i] = RECORD.unpack_from(block.buf, i * record_size)[5]
+	order = sorted(range(len(lines)), key=lambda i: (i in estimates,
+		estimates[i] if i in estimates else costs[lines[i]]), reverse=True)
+	solving = run(order, False)
+	finished = set()
+	next_i = 0
+	while next_i < len(lines):
+		try:
+			finished.add(done.get(timeout=1))
+		except Empty:
+			# Raise any error that stopped a worker
+			if solving.ready():
+				solving.get()
+			continue
+		while next_i in finished:
+			finished.remove(next_i)
+			state, solved, hardest, given, num_solved, cost, seconds = RECORD.unpack_from(
+				block.buf, next_i * record_size)
+			if state == ERROR:
+				# Solve it again here to find out what the error was
+				result, error, seconds = solve_line((lines[next_i], None, guess, exhaustive))
+				yield lines[next_i], result, error, seconds
+			else:
+				yield lines[next_i], {'solved_cells': num_solved - given,
+					'solved': bool(solved), 'board': lines[next_i],
+					'strategy': Sudoku.strategies[difficulties[hardest]].name}, None, seconds
+			next_i += 1
+	solving.get()
@@ -0,0 +1,52 @@
+from __future__ import print_function
+
+from utils import *
+from cell import *
+from board import *
+
+from importlib import import_module
+import os
+import re
+
+# A strategy's decorator, with its name and difficulty and whether it is a
+# uniqueness strategy
+DECORATOR = re.compile(r"^@Sudoku\.strategy\('([^']+)', ([\d.]+)(, uniqueness=True)?\)$", re.M)
+
+def read_manifest():
+	"""Return the difficulty, name, module, and uniqueness of each strategy in
+	this package, as its decorator gives them, without importing any of the
+	modules that define them."""
+	directory = os.path.dirname(os.path.abspath(__file__))
+	manifest = []
+	for filename in sorted(os.listdir(directory)):
+		module, extension = os.path.splitext(filename)
+		if extension != '.py' or module == '__init__':
+			continue
+		with open(os.path.join(directory, filename), 'r') as source:
+			for name, difficulty, uniqueness in DECORATOR.findall(source.read()):
+				difficulty = float(difficulty) if '.' in difficulty else int(difficulty)
+				manifest.append((difficulty, name, module, bool(uniqueness)))
+	return sorted(manifest)
+
+# The difficulty, name, module, and uniqueness of each strategy in this
+# package. A module is only imported the first time an unsolved board reaches
+# one of its strategies, so solving easy boards imports little
+MANIFEST = read_manifest()
+
+def lazy_strategy(difficulty, name, module, uniqueness):
+	"""Register a stand-in for a strategy that imports its module (which
+	registers the real strategy in its place) the first time it is used on an
+	unsolved board, and then uses the real strategy."""
+	def stand_in(sudoku, verbose):
+		if sudoku.solved() or (uniqueness and not sudoku.unique):
+			return False
+		import_module('strategies.' + module)
+		strategy = Sudoku.strategies[difficulty]
+		if strategy.function is stand_in:
+			raise ImportError('strategies.%s does not define %s' % (module, name))
+		return strategy.function(sudoku, verbose)
+	Sudoku.strategies[difficulty] = Strategy(name, stand_in)
+
+for difficulty, name, module, uniqueness in MANIFEST:
+	if difficulty not in Sudoku.strategies:
+		lazy_strategy(difficulty, name, module, uniqueness)
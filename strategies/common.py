@@ -0,0 +1,68 @@
+from __future__ import print_function
+
+from utils import *
+from cell import *
+from board import *
+
+from itertools import product
+
+def solve_from_each(sudoku, solve_from, starts, verbose, parallel=False):
+	"""Try a strategy from each starting point in order, and return whether it
+	made progress. Stop after the first progress, unless the board is being
+	solved exhaustively; then keep trying each starting point until it makes
+	no more progress before moving on to the next one.
+
+	If parallel is true and the board has a pool of processes, they look for
+	the first starting point that makes progress, which is then tried again on
+	the board itself; so the result is the same as trying them in order."""
+	if parallel and sudoku.pool is not None and not sudoku.exhaustive:
+		while starts:
+			i = sudoku.pool.first(sudoku, solve_from, starts)
+			if i is None:
+				return False
+			if solve_from(sudoku, *(starts[i] + (verbose,))):
+				return True
+			starts = starts[i+1:]
+		return False
+	if not sudoku.exhaustive:
+		return any(solve_from(sudoku, *(start + (verbose,))) for start in starts)
+	changed = False
+	for start in starts:
+		while solve_from(sudoku, *(start + (verbose,))):
+			strip_all_naked_singles(sudoku, verbose)
+			changed = True
+	return changed
+
+def strip_all_naked_singles(sudoku, verbose):
+	"""Exclude the values of solved cells from all their peers, as the other
+	strategies assume has been done, before an exhaustive pass continues."""
+	while any([solve_strip_naked_single(sudoku, x, y, verbose)
+		for y, x in product(range(sudoku.size), range(sudoku.size))]):
+		pass
+
+def solve_strip_naked_single(sudoku, x, y, verbose):
+	cell = sudoku.cell(x, y)
+	if cell.solved():
+		return False
+	seen_values = 0
+	for u, _ in sudoku.unit_positions(cell):
+		seen_values |= sudoku.solved_values[u]
+	seen_values &= cell.mask
+	changed = cell.exclude(bitmask_values(seen_values))
+	if verbose and changed:
+		print(' * Cell %s can only be %s' % (cell.cell_name(),
+			cell.value_string()))
+	if changed:
+		sudoku.deduced([c for c in sudoku.peer_lists[sudoku.cell_index(cell)]
+			if c.solved() and c.mask & seen_values])
+	return changed
+
+def clear_chain_colors(sudoku, changed):
+	"""Clear the colors of a chain from every cell, and report the cells it
+	colored as the pattern of a deduction if it made one."""
+	chain = [c for c in sudoku.cells() if c.dcs] if changed else []
+	for cell in sudoku.cells():
+		cell.clear_colors()
+	if changed:
+		sudoku.deduced(chain)
+	return changed
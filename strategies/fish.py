@@ -0,0 +1,76 @@
+from __future__ import print_function
+
+from utils import *
+from cell import *
+from board import *
+from strategies.common import *
+
+from itertools import product, combinations
+
+@Sudoku.strategy('X-wing', 10)
+def solve_x_wings(sudoku, verbose):
+	"""Find two pairs of cells with a unique candidate in two different units,
+	that are also both in two intersecting units, and exclude that candidate
+	from the other cells in the intersecting units."""
+	return solve_n_fish(sudoku, 2, verbose)
+
+@Sudoku.strategy('swordfish', 12)
+def solve_swordfish(sudoku, verbose):
+	"""Find three triples of cells with a unique candidate in three different
+	units, that are also both in three intersecting units, and exclude that
+	candidate from the other cells in the intersecting units."""
+	return solve_n_fish(sudoku, 3, verbose)
+
+@Sudoku.strategy('jellyfish', 16)
+def solve_jellyfish(sudoku, verbose):
+	"""Find four quads of cells with a unique candidate in four different units,
+	that are also both in four intersecting units, and exclude that candidate
+	from the other cells in the intersecting units."""
+	return solve_n_fish(sudoku, 4, verbose)
+
+def solve_n_fish(sudoku, n, verbose):
+	return any(solve_n_fish_in_units(sudoku, unit_type, n, indexes, verbose)
+		for unit_type, indexes in product(['row', 'column'], combinations(range(sudoku.size), n)))
+
+def solve_n_fish_in_units(sudoku, unit_type, n, indexes, verbose):
+	changed = False
+	units = [sudoku.unit(unit_type, i) for i in indexes]
+	for d in sudoku.values:
+		filtered_units = [c for u in units for c in u if not c.solved() and d in c.ds]
+		other_indexes = []
+		if unit_type == 'row':
+			if len({c.y for c in filtered_units}) != n:
+				continue
+			other_unit_type = 'column'
+			other_indexes = {c.x for c in filtered_units}
+		elif unit_type == 'column':
+			if len({c.x for c in filtered_units}) != n:
+				continue
+			other_unit_type = 'row'
+			other_indexes = {c.y for c in filtered_units}
+		if len(other_indexes) != n:
+			continue
+		n_fish_changed = False
+		n_fish_solved = []
+		for i in other_indexes:
+			other_unit = sudoku.unit(other_unit_type, i)
+			for cell in other_unit:
+				if cell in filtered_units:
+					continue
+				cell_changed = cell.exclude({d})
+				if cell_changed and cell.solved():
+					n_fish_solved.append(cell)
+				n_fish_changed |= cell_changed
+		changed |= n_fish_changed
+		if verbose and n_fish_changed:
+			print(' * In %ss (%s), %d can only be in %ss (%s)' %
+				(other_unit_type, ', '.join(sudoku.unit_name(other_unit_type, i)
+						for i in sorted(other_indexes)),
+					d, unit_type, ', '.join(sudoku.unit_name(unit_type, i)
+						for i in sorted(indexes))))
+			for cell in n_fish_solved:
+				print('    > Cell %s can only be %s' %
+					(cell.cell_name(), cell.value()))
+		if n_fish_changed:
+			sudoku.deduced(filtered_units)
+	return changed
@@ -0,0 +1,423 @@
+from __future__ import print_function
+
+from utils import *
+from color import *
+from cell import *
+from board import *
+from strategies.common import *
+
+from itertools import product
+
+@Sudoku.strategy('bi-value cell forcing chain', 17)
+def solve_cell_forcing_chains(sudoku, verbose):
+	"""Color two candidates of a bi-value cell red and blue, and propagate the
+	colors outward as if they were the actual values of that cell; then exclude
+	candidates based on the derived contradictions or tautologies."""
+	return solve_from_each(sudoku, solve_cell_forcing_chain_from,
+		[(x, y) for y, x in product(range(sudoku.size), range(sudoku.size))], verbose)
+
+def solve_cell_forcing_chain_from(sudoku, x, y, verbose):
+	start_cell = sudoku.cell(x, y)
+	if not start_cell.bi_value():
+		return False
+	p, q = sorted(start_cell.ds)
+	start_cell.add_color(p, Color.RED)
+	start_cell.add_color(q, Color.BLUE)
+	while (forcing_chain_propagate_naked_color(sudoku, Color.RED, verbose) or
+		forcing_chain_propagate_naked_color(sudoku, Color.BLUE, verbose) or
+		forcing_chain_propagate_hidden_color(sudoku, Color.RED, verbose) or
+		forcing_chain_propagate_hidden_color(sudoku, Color.BLUE, verbose)):
+		pass
+	print_start = lambda: (cell_forcing_chain_print_start(sudoku, start_cell), print(sudoku))
+	changed = forcing_chain_check(sudoku, print_start, verbose)
+	return clear_chain_colors(sudoku, changed)
+
+def cell_forcing_chain_print_start(sudoku, start_cell):
+	p, q = sorted(start_cell.ds)
+	print(' - Start from cell %s, coloring %d %s and %d %s' %
+		(start_cell.cell_name(), p, start_cell.dcs[p], q, start_cell.dcs[q]))
+
+@Sudoku.strategy('dual unit forcing chain', 18)
+def solve_unit_forcing_chains(sudoku, verbose):
+	"""Color two bi-location candidates in a unit red and blue, and propagate
+	the colors outward as if they were the actual values of those cells; then
+	exclude candidates based on the derived contradictions or tautologies."""
+	return solve_from_each(sudoku, solve_unit_forcing_chain_from,
+		list(product(Sudoku.UNIT_TYPES, range(sudoku.size), sudoku.values)), verbose,
+		parallel=True)
+
+def solve_unit_forcing_chain_from(sudoku, unit_type, i, d, verbose):
+	unit = sudoku.unit(unit_type, i)
+	start_cells = [c for c in unit if d in c.ds]
+	if len(start_cells) != 2:
+		return False
+	start_red, start_blue = sorted(start_cells)
+	start_red.add_color(d, Color.RED)
+	start_blue.add_color(d, Color.BLUE)
+	while (forcing_chain_propagate_naked_color(sudoku, Color.RED, verbose) or
+		forcing_chain_propagate_naked_color(sudoku, Color.BLUE, verbose) or
+		forcing_chain_propagate_hidden_color(sudoku, Color.RED, verbose) or
+		forcing_chain_propagate_hidden_color(sudoku, Color.BLUE, verbose)):
+		pass
+	print_start = lambda: (unit_forcing_chain_print_start(sudoku, unit_type, i, d), print(sudoku))
+	changed = forcing_chain_check(sudoku, print_start, verbose)
+	return clear_chain_colors(sudoku, changed)
+
+def unit_forcing_chain_print_start(sudoku, unit_type, i, d):
+	unit = sudoku.unit(unit_type, i)
+	start_cells = [c for c in unit if d in c.ds]
+	start_red, start_blue = sorted(start_cells)
+	print(' - Start from %s %s, coloring %d %s in cell %s and %s in cell %s' %
+		(unit_type, sudoku.unit_name(unit_type, i), d, start_red.dcs[d],
+			start_red.cell_name(), start_blue.dcs[d], start_blue.cell_name()))
+
+def forcing_chain_propagate_naked_color(sudoku, color, verbose):
+	colored = False
+	for cell in sudoku.cells():
+		if cell.solved() or any(r & color for r in cell.dcs.values()):
+			continue
+		seen = sudoku.seen_from(cell.x, cell.y)
+		seen_colored = union({d for d in c.dcs if c.dcs[d] & color} for c in seen)
+		candidates = cell.ds - seen_colored
+		if len(candidates) == 1:
+			d, = candidates
+			cell.add_color(d, color)
+			colored = True
+	return colored
+
+def forcing_chain_propagate_hidden_color(sudoku, color, verbose):
+	colored = False
+	for cell in sudoku.cells():
+		if cell.solved() or any(r & color for r in cell.dcs.values()):
+			continue
+		seen = sudoku.seen_from(cell.x, cell.y)
+		for unit_type, d in product(Sudoku.UNIT_TYPES, cell.ds):
+			seen_unit = sudoku.unit_without(unit_type, cell.x, cell.y)
+			if all(c.dcs.get(d, Color.NEITHER) == ~color for c in seen_unit):
+				cell.add_color(d, color)
+				colored = True
+	return colored
+
+def forcing_chain_check(sudoku, print_start, verbose):
+	"""Exclude candidates based on any contradiction in the colored board, or
+	else on every tautology.
+
+	All the conditions are found in one pass over the cells, which gets the
+	colors seen from each uncolored candidate only once, and then used in the
+	same order as checking for each kind in turn would. Using one only changes
+	the candidates of its own cell, so none of the others are affected."""
+	summary = forcing_chain_color_summary(sudoku)
+	unit_contradiction = forcing_chain_find_unit_contradiction(sudoku, summary)
+	seen_contradiction = None
+	purple_cells, full_cells, emptied_cells, seen_cells = [], [], [], []
+	for cell in sudoku.cells():
+		uncolored = cell.ds - set(cell.dcs)
+		seen_colors = {d: forcing_chain_seen_colors(sudoku, summary, cell, d) for d in uncolored}
+		if not cell.dcs:
+			if all({Color.RED, Color.PURPLE} & seen_colors[d] for d in cell.ds):
+				seen_contradiction = cell, Color.RED
+			elif all({Color.BLUE, Color.PURPLE} & seen_colors[d] for d in cell.ds):
+				seen_contradiction = cell, Color.BLUE
+			if seen_contradiction:
+				break
+		if unit_contradiction:
+			# Only a contradiction seen from a cell could come before it
+			continue
+		colors = set(cell.dcs.values())
+		if Color.PURPLE in colors:
+			purple_cells.append(cell)
+		if len(colors) == 2:
+			full_cells.append(cell)
+		if not cell.solved():
+			emptied_cells.extend((cell, d) for d in uncolored if len(seen_colors[d]) == 2)
+		if len(cell.dcs) == 1:
+			(d_colored, d_color), = cell.dcs.items()
+			seen_cells.extend((cell, d) for d in uncolored
+				if any(color & ~d_color for color in seen_colors[d]))
+	if seen_contradiction:
+		return forcing_chain_use_seen_contradiction(sudoku, seen_contradiction, print_start,
+			verbose)
+	if unit_contradiction:
+		return forcing_chain_use_unit_contradiction(sudoku, unit_contradiction, print_start,
+			verbose)
+	changed = forcing_chain_use_purple_cells(sudoku, purple_cells, print_start, verbose)
+	if changed: print_start = lambda: None
+	changed |= forcing_chain_use_full_cells(sudoku, full_cells, print_start, verbose)
+	if changed: print_start = lambda: None
+	changed |= forcing_chain_use_emptied_cells(sudoku, emptied_cells, print_start, verbose)
+	if changed: print_start = lambda: None
+	changed |= forcing_chain_use_seen_cells(sudoku, seen_cells, print_start, verbose)
+	return changed
+
+def forcing_chain_color_summary(sudoku):
+	"""Return the colors of each candidate in each unit, as lists indexed by
+	unit (rows, then columns, then blocks) and then by candidate."""
+	summary = [[[] for _ in range(sudoku.size + 1)] for _ in range(3 * sudoku.size)]
+	for cell in sudoku.cells():
+		if not cell.dcs:
+			continue
+		units = [u for u, _ in sudoku.unit_positions(cell)]
+		for d, color in cell.dcs.items():
+			for u in units:
+				summary[u][d].append(color)
+	return summary
+
+def forcing_chain_seen_colors(sudoku, summary, cell, d):
+	"""Return the colors of candidate d in the cells seen from a cell that
+	does not have d colored itself."""
+	(r, _), (c, _), (b, _) = sudoku.unit_positions(cell)
+	return set(summary[r][d]) | set(summary[c][d]) | set(summary[b][d])
+
+def forcing_chain_find_unit_contradiction(sudoku, summary):
+	"""Return the first unit and candidate with more than one cell in the same
+	color, and that color; or None if there are none."""
+	for u, d in product(range(3 * sudoku.size), sudoku.values):
+		colors = summary[u][d]
+		if len(colors) < 2:
+			continue
+		if colors.count(Color.RED) > 1 or Color.RED in colors and Color.PURPLE in colors:
+			return u, d, Color.RED
+		if colors.count(Color.BLUE) > 1 or Color.BLUE in colors and Color.PURPLE in colors:
+			return u, d, Color.BLUE
+	return None
+
+def forcing_chain_use_seen_contradiction(sudoku, contradiction, print_start, verbose):
+	cell, seen_color = contradiction
+	if verbose:
+		print_start()
+		print(' - Find cells that can see all their candidates in the same color')
+		print(' * Cell %s can see all its candidates %s in %s' %
+			(cell.cell_name(), cell.value_string(), seen_color))
+	return forcing_chain_use_color(sudoku, ~seen_color, verbose)
+
+def forcing_chain_use_unit_contradiction(sudoku, contradiction, print_start, verbose):
+	u, d, dup_color = contradiction
+	if verbose:
+		unit_type, i = Sudoku.UNIT_TYPES[u // sudoku.size], u % sudoku.size
+		print_start()
+		print(' - Find a unit with multiple cells with the same candidate in the same color')
+		dup_cell_names = [c.cell_name() for c in sudoku.unit(unit_type, i)
+			if c.dcs.get(d, Color.NEITHER) & dup_color]
+		print(' - %s %s has multiple cells (%s) with candidate %d colored %s' %
+			(unit_type.capitalize(), sudoku.unit_name(unit_type, i),
+				', '.join(dup_cell_names), d, dup_color))
+	return forcing_chain_use_color(sudoku, ~dup_color, verbose)
+
+def forcing_chain_use_color(sudoku, color, verbose):
+	if verbose:
+		print(' - Use all candidates colored %s' % color)
+	changed = False
+	for cell in sudoku.cells():
+		for d in cell.dcs:
+			if not (cell.dcs[d] & color):
+				continue
+			changed |= cell.include_only({d})
+			if verbose:
+				print(' * Cell %s can only be %s' % (cell.cell_name(),
+					cell.value_string()))
+	return changed
+
+def forcing_chain_use_purple_cells(sudoku, cells, print_start, verbose):
+	changed = False
+	for cell in cells:
+		d, = [d for d in cell.dcs if cell.dcs[d] == Color.PURPLE]
+		cell_changed = cell.include_only({d})
+		if verbose and cell_changed:
+			if not changed:
+				print_start()
+				print(' - Find cells with candidates colored purple')
+			print('    > Cell %s can only be %s' % (cell.cell_name(),
+				cell.value_string()))
+		changed |= cell_changed
+	return changed
+
+def forcing_chain_use_full_cells(sudoku, cells, print_start, verbose):
+	changed = False
+	for cell in cells:
+		cell_changed = cell.include_only(cell.dcs.keys())
+		if verbose and cell_changed:
+			if not changed:
+				print_start()
+				print(' - Find cells with candidates in both colors and others uncolored')
+			print('    > Cell %s can only be %s' % (cell.cell_name(),
+				cell.value_string()))
+		changed |= cell_changed
+	return changed
+
+def forcing_chain_use_emptied_cells(sudoku, cell_candidates, print_start, verbose):
+	changed = False
+	for cell, d in cell_candidates:
+		cell_changed = cell.exclude({d})
+		if verbose and cell_changed:
+			if not changed:
+				print_start()
+				print(' - Find cells with an uncolored candidate that can be seen in both colors')
+			print('    * Cell %s can only be %s, since it can see %d in both colors' %
+				(cell.cell_name(), cell.value_string(), d))
+		changed |= cell_changed
+	return changed
+
+def forcing_chain_use_seen_cells(sudoku, cell_candidates, print_start, verbose):
+	changed = False
+	for cell, d in cell_candidates:
+		(d_colored, d_color), = cell.dcs.items()
+		cell_changed = cell.exclude({d})
+		if verbose and cell_changed:
+			if not changed:
+				print_start()
+				print(' - Find cells with a candidate in one color that can see it in the other color')
+			print('    * Cell %s can only be %s, since its %d is %s and it can see %d in %s' %
+				(cell.cell_name(), cell.value_string(), d_colored,
+					d_color, d, ~d_color))
+		changed |= cell_changed
+	return changed
+
+@Sudoku.strategy('Nishio forcing chain', 19)
+def solve_nishio_forcing_chains(sudoku, verbose):
+	"""Turn a candidate in an unsolved cell on, and propagate other on/off
+	candidates outward as if the starting one were actually on; then
+	exclude candidates based on the derived contradictions or tautologies."""
+	return solve_from_each(sudoku, solve_nishio_forcing_chain_from,
+		[(c.x, c.y) for c in sorted(sudoku.cells(), key=lambda c: (len(c.ds), c))], verbose,
+		parallel=True)
+
+def solve_nishio_forcing_chain_from(sudoku, x, y, verbose):
+	start_cell = sudoku.cell(x, y)
+	if start_cell.solved():
+		return False
+	for d in start_cell.ds:
+		start_cell.add_color(d, Color.BLUE)
+		while (nishio_forcing_chain_propagate_on(sudoku, verbose) or
+			nishio_forcing_chain_propagate_off(sudoku, verbose)):
+			pass
+		print_start = lambda: (nishio_forcing_chain_print_start(sudoku, start_cell, d), print(sudoku))
+		if (nishio_forcing_chain_check_cell_contradictions(sudoku, print_start, verbose) or
+			nishio_forcing_chain_check_unit_contradictions(sudoku, print_start, verbose)):
+			start_cell.exclude({d})
+			if verbose:
+				print(' * Cell %s can only be %s' % (start_cell.cell_name(),
+					start_cell.value_string()))
+			return clear_chain_colors(sudoku, True)
+		for cell in sudoku.cells():
+			cell.clear_colors()
+	return False
+
+def nishio_forcing_chain_print_start(sudoku, start_cell, d):
+	print(' - Start chains from cell %s, turning %d on' %
+		(start_cell.cell_name(), d))
+
+@Sudoku.strategy('anti-Nishio forcing chain', 20)
+def solve_anti_nishio_forcing_chains(sudoku, verbose):
+	"""Turn a candidate in an unsolved cell off, and propagate other on/off
+	candidates outward as if the starting one were actually off; then
+	exclude candidates based on the derived contradictions or tautologies."""
+	return solve_from_each(sudoku, solve_anti_nishio_forcing_chain_from,
+		[(c.x, c.y) for c in sorted(sudoku.cells(), key=lambda c: (len(c.ds), c))], verbose,
+		parallel=True)
+
+def solve_anti_nishio_forcing_chain_from(sudoku, x, y, verbose):
+	start_cell = sudoku.cell(x, y)
+	if start_cell.solved():
+		return False
+	for d in start_cell.ds:
+		start_cell.add_color(d, Color.RED)
+		while (nishio_forcing_chain_propagate_on(sudoku, verbose) or
+			nishio_forcing_chain_propagate_off(sudoku, verbose)):
+			pass
+		print_start = lambda: (anti_nishio_forcing_chain_print_start(sudoku, start_cell, d), print(sudoku))
+		if (nishio_forcing_chain_check_cell_contradictions(sudoku, print_start, verbose) or
+			nishio_forcing_chain_check_unit_contradictions(sudoku, print_start, verbose)):
+			start_cell.include_only({d})
+			if verbose:
+				print(' * Cell %s can only be %s' % (start_cell.cell_name(),
+					start_cell.value_string()))
+			return clear_chain_colors(sudoku, True)
+		for cell in sudoku.cells():
+			cell.clear_colors()
+	return False
+
+def anti_nishio_forcing_chain_print_start(sudoku, start_cell, d):
+	print(' - Start chains from cell %s, turning %d off' %
+		(start_cell.cell_name(), d))
+
+def nishio_forcing_chain_propagate_on(sudoku, verbose):
+	colored = False
+	for cell in sudoku.cells():
+		if cell.solved():
+			continue
+		seen = sudoku.seen_from(cell.x, cell.y)
+		for d in cell.ds:
+			if cell.dcs.get(d, Color.NEITHER) & Color.BLUE:
+				continue
+			if all(cell.dcs.get(p, Color.NEITHER) & Color.RED for p in cell.ds - {d}):
+				cell.add_color(d, Color.BLUE)
+				colored = True
+				break
+			elif all(c.dcs.get(d, Color.NEITHER) & Color.RED for c in seen
+				if not c.solved() and d in c.ds):
+				cell.add_color(d, Color.BLUE)
+				colored = True
+				break
+	return colored
+
+def nishio_forcing_chain_propagate_off(sudoku, verbose):
+	colored = False
+	for cell in sudoku.cells():
+		if cell.solved():
+			continue
+		seen = sudoku.seen_from(cell.x, cell.y)
+		for d in cell.ds:
+			if (not any(cell.dcs.get(p, Color.NEITHER) & Color.RED for p in cell.ds - {d}) and
+				(cell.dcs.get(d, Color.NEITHER) & Color.BLUE)):
+				for p in cell.ds - {d}:
+					cell.add_color(p, Color.RED)
+				colored = True
+				break
+			elif (not (cell.dcs.get(d, Color.NEITHER) & Color.RED) and
+				any(c.dcs.get(d, Color.NEITHER) & Color.BLUE for c in seen)):
+				cell.add_color(d, Color.RED)
+				colored = True
+	return colored
+
+def nishio_forcing_chain_check_cell_contradictions(sudoku, print_start, verbose):
+	for cell in sudoku.cells():
+		if Color.PURPLE in cell.dcs.values():
+			if verbose:
+				print_start()
+				print(' - Find a cell with a candidate turned both on and off')
+				purple_candidates = {d for d in cell.dcs if cell.dcs[d] == Color.PURPLE}
+				print(' - Cell %s has %s turned on and off' %
+					(cell.cell_name(), set_string(purple_candidates)))
+			return True
+		if all(cell.dcs.get(d, Color.NEITHER) & Color.RED for d in cell.ds):
+			if verbose:
+				print_start()
+				print(' - Find a cell with all candidates turned off')
+				print(' - Cell %s has all candidates %s turned off' %
+					(cell.cell_name(), cell.value_string()))
+			return True
+	return False
+
+def nishio_forcing_chain_check_unit_contradictions(sudoku, print_start, verbose):
+	for unit_type, i, d in product(Sudoku.UNIT_TYPES, range(sudoku.size), sudoku.values):
+		unit = sudoku.unit(unit_type, i)
+		if all(c.dcs.get(d, Color.NEITHER) & Color.RED for c in unit):
+			if verbose:
+				print_start()
+				print(' - Find a unit with all of a candidate turned off')
+				red_cells = [c for c in unit if c.dcs.get(d, Color.NEITHER) & Color.RED]
+				print(' * In %s %s, cells (%s) have %d turned off' %
+					(unit_type, sudoku.unit_name(unit_type, i),
+						', '.join(c.cell_name() for c in red_cells), d))
+			return True
+		blue_cells = [c for c in unit if (c.dcs.get(d, Color.NEITHER) & Color.BLUE) or
+			c.value() == d]
+		if len(blue_cells) > 1:
+			if verbose:
+				print_start()
+				print(' - Find a unit with more than one of a candidate turned on')
+				print(' * In %s %s, cells (%s) have %d turned on' %
+					(unit_type, sudoku.unit_name(unit_type, i),
+						', '.join(c.cell_name() for c in blue_cells), d))
+			return True
+	return False
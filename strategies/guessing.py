@@ -0,0 +1,49 @@
+from __future__ import print_function
+
+from utils import *
+from cell import *
+from board import *
+from strategies.common import *
+
+@Sudoku.strategy('guessing', 999)
+def solve_guessing(sudoku, verbose):
+	"""Guess a candidate for a cell and see if a contradiction occurs."""
+	guesses = [(c.x, c.y, d) for c in sorted(sudoku.cells(), key=lambda c: (len(c.ds), c))
+		if not c.solved() for d in c.ds]
+	if sudoku.pool is not None:
+		outcomes = sudoku.pool.map(sudoku, guess_outcome, guesses)
+	else:
+		outcomes = (guess_outcome(sudoku, *guess) for guess in guesses)
+	for i, outcome in enumerate(outcomes):
+		if outcome is not None:
+			x, y, d = guesses[i]
+			return apply_guess(sudoku, sudoku.cell(x, y), d, outcome, verbose)
+	return False
+
+def guess_outcome(sudoku, x, y, d):
+	"""Solve a copy of the board as if a cell were d, and return False if that
+	leads to a contradiction, True if it solves the board, or else None."""
+	guess = sudoku.copy()
+	try:
+		guess.cell(x, y).include_only({d})
+		guess.solve(exclude=[999], verbose=False)
+		guess.verify()
+	except RuntimeError:
+		return False
+	return True if guess.solved() else None
+
+def apply_guess(sudoku, start_cell, d, outcome, verbose):
+	if not outcome:
+		start_cell.exclude({d})
+		if verbose:
+			print(sudoku)
+			print(' * Cell %s cannot be %d (guessed; there is a contradiction)' %
+				(start_cell.cell_name(), d))
+	else:
+		start_cell.include_only({d})
+		if verbose:
+			print(sudoku)
+			print(' * Cell %s is %d (guessed successfully)' %
+				(start_cell.cell_name(), d))
+	sudoku.deduced([start_cell])
+	return True
@@ -0,0 +1,84 @@
+from __future__ import print_function
+
+from utils import *
+from cell import *
+from board import *
+from strategies.common import *
+
+from itertools import product
+
+@Sudoku.strategy('unit intersection', 9)
+def solve_unit_intersections(sudoku, verbose):
+	"""Find pairs/triples of cells in a unit with a unique candidate, that are
+	also all in one intersecting unit, and exclude that candidate from the
+	other cells in the intersecting unit."""
+	n = sudoku.box
+	# The positions in a row or column that are in each block, which are also
+	# the positions in a block that are in each row; and the positions in a
+	# block that are in each column
+	segments = [((1 << n) - 1) << (k * n) for k in range(n)]
+	block_columns = [bitmask(r * n + c for r in range(n)) for c in range(n)]
+	return any(solve_unit_intersections_in_unit(sudoku, unit_type, i, segments,
+		block_columns, verbose)
+		for unit_type, i in product(Sudoku.UNIT_TYPES, range(sudoku.size)))
+
+def solve_unit_intersections_in_unit(sudoku, unit_type, i, segments, block_columns, verbose):
+	changed = False
+	n = sudoku.box
+	u = Sudoku.UNIT_TYPES.index(unit_type) * sudoku.size + i
+	locations = sudoku.locations[u]
+	unsolved = ~sudoku.solved_positions[u]
+	for d in sudoku.values:
+		positions = locations[d] & unsolved
+		if not positions:
+			continue
+		single = not positions & (positions - 1)
+		intersection_type = intersection_i = None
+		if unit_type == 'row':
+			k = segment_index(positions, segments)
+			if single:
+				intersection_type, intersection_i = 'column', positions.bit_length() - 1
+			elif k is not None:
+				intersection_type, intersection_i = 'block', i // n * n + k
+		elif unit_type == 'column':
+			k = segment_index(positions, segments)
+			if single:
+				intersection_type, intersection_i = 'row', positions.bit_length() - 1
+			elif k is not None:
+				intersection_type, intersection_i = 'block', k * n + i // n
+		else:
+			r = segment_index(positions, segments)
+			c = segment_index(positions, block_columns)
+			if r is not None:
+				intersection_type, intersection_i = 'row', i // n * n + r
+			elif c is not None:
+				intersection_type, intersection_i = 'column', i % n * n + c
+		if intersection_type is None:
+			continue
+		v = Sudoku.UNIT_TYPES.index(intersection_type) * sudoku.size + intersection_i
+		cells = sudoku.unit_cells[v] & ~sudoku.unit_cells[u] & sudoku.candidate_cells[d]
+		if not cells:
+			continue
+		changed = True
+		intersection_changed_cells = sudoku.cells_in(cells)
+		for cell in intersection_changed_cells:
+			cell.exclude({d})
+		if verbose:
+			print(' * In %s %s, only a %s in %s %s can be %d' %
+				(unit_type, sudoku.unit_name(unit_type, i),
+					n_tuple_name(popcount(positions)), intersection_type,
+					sudoku.unit_name(intersection_type, intersection_i), d))
+			for cell in intersection_changed_cells:
+				print('    > Cell %s can only be %s' %
+					(cell.cell_name(), cell.value_string()))
+		unit = sudoku.unit(unit_type, i)
+		sudoku.deduced([unit[p] for p in bitmask_values(positions)])
+	return changed
+
+def segment_index(positions, segments):
+	"""Return the index of the segment that contains all the given positions,
+	or None if they are not all in one."""
+	for k, segment in enumerate(segments):
+		if not positions & ~segment:
+			return k
+	return None
@@ -0,0 +1,246 @@
+from __future__ import print_function
+
+from utils import *
+from color import *
+from cell import *
+from board import *
+from strategies.common import *
+
+from itertools import product
+
+@Sudoku.strategy('3D Medusa', 14)
+def solve_3d_medusas(sudoku, verbose):
+	"""Color two candidates of a bi-value cell red and blue, and propagate the
+	colors outward along strong links; then infer the correct color based on the
+	derived contradictions or tautologies."""
+	return solve_from_each(sudoku, solve_3d_medusas_from,
+		[(x, y) for y, x in product(range(sudoku.size), range(sudoku.size))], verbose,
+		parallel=True)
+
+def solve_3d_medusas_from(sudoku, x, y, verbose):
+	start_cell = sudoku.cell(x, y)
+	if not start_cell.bi_value():
+		return False
+	p, q = sorted(start_cell.ds)
+	start_cell.add_color(p, Color.RED)
+	start_cell.add_color(q, Color.BLUE)
+	while (medusa_color_bi_value_cells(sudoku, verbose) or
+		medusa_color_bi_location_units(sudoku, verbose)):
+		pass
+	print_start = lambda: (m3d_medusa_print_chain_start(sudoku, start_cell), print(sudoku))
+	changed = (medusa_check_cell_contradictions(sudoku, print_start, verbose) or
+		medusa_check_unit_contradictions(sudoku, print_start, verbose) or
+		medusa_check_seen_contradictions(sudoku, print_start, verbose))
+	if not changed:
+		changed |= medusa_check_full_cells(sudoku, print_start, verbose)
+		if changed: print_start = lambda: None
+		changed |= medusa_check_emptied_cells(sudoku, print_start, verbose)
+		if changed: print_start = lambda: None
+		changed |= medusa_check_partial_cells(sudoku, print_start, verbose)
+	return clear_chain_colors(sudoku, changed)
+
+def m3d_medusa_print_chain_start(sudoku, start_cell):
+	p, q = sorted(start_cell.ds)
+	print(' - Start chains from cell %s, coloring %d %s and %d %s' %
+		(start_cell.cell_name(), p, start_cell.dcs[p], q, start_cell.dcs[q]))
+
+@Sudoku.strategy('dual Medusa', 15)
+def solve_dual_medusas(sudoku, verbose):
+	"""Color two bi-location candidates in a unit red and blue, and propagate
+	the colors outward along strong links; then infer the correct color based on
+	the derived contradictions or tautologies."""
+	return any(solve_dual_medusas_from(sudoku, unit_type, i, d, verbose)
+		for unit_type, i, d in product(Sudoku.UNIT_TYPES, range(sudoku.size), sudoku.values))
+
+def solve_dual_medusas_from(sudoku, unit_type, i, d, verbose):
+	unit = sudoku.unit(unit_type, i)
+	start_cells = [c for c in unit if d in c.ds]
+	if len(start_cells) != 2:
+		return False
+	start_red, start_blue = sorted(start_cells)
+	start_red.add_color(d, Color.RED)
+	start_blue.add_color(d, Color.BLUE)
+	while (medusa_color_bi_value_cells(sudoku, verbose) or
+		medusa_color_bi_location_units(sudoku, verbose)):
+		pass
+	print_start = lambda: (dual_medusa_print_chain_start(sudoku, unit_type, i, d), print(sudoku))
+	changed = (medusa_check_cell_contradictions(sudoku, print_start, verbose) or
+		medusa_check_unit_contradictions(sudoku, print_start, verbose) or
+		medusa_check_seen_contradictions(sudoku, print_start, verbose))
+	if not changed:
+		changed |= medusa_check_full_cells(sudoku, print_start, verbose)
+		if changed: print_start = lambda: None
+		changed |= medusa_check_emptied_cells(sudoku, print_start, verbose)
+		if changed: print_start = lambda: None
+		changed |= medusa_check_partial_cells(sudoku, print_start, verbose)
+	return clear_chain_colors(sudoku, changed)
+
+def dual_medusa_print_chain_start(sudoku, unit_type, i, d):
+	unit = sudoku.unit(unit_type, i)
+	start_cells = [c for c in unit if d in c.ds]
+	start_red, start_blue = sorted(start_cells)
+	print(' - Start from %s %s, coloring %d %s in cell %s and %s in cell %s' %
+		(unit_type, sudoku.unit_name(unit_type, i), d, start_red.dcs[d],
+			start_red.cell_name(), start_blue.dcs[d], start_blue.cell_name()))
+
+def medusa_color_bi_value_cells(sudoku, verbose):
+	colored = False
+	for cell in sudoku.cells():
+		if not cell.bi_value() or len(cell.dcs) != 1:
+			continue
+		d_colored, d_uncolored = cell.ds
+		if d_uncolored in cell.dcs:
+			d_colored, d_uncolored = d_uncolored, d_colored
+		cell.add_color(d_uncolored, ~cell.dcs[d_colored])
+		colored = True
+	return colored
+
+def medusa_color_bi_location_units(sudoku, verbose):
+	colored = False
+	for unit_type, i in product(Sudoku.UNIT_TYPES, range(sudoku.size)):
+		unit = sudoku.unit(unit_type, i)
+		unsolved_ds = union(c.ds for c in unit if not c.solved())
+		for d in unsolved_ds:
+			filtered_unit = [c for c in unit if not c.solved() and d in c.ds]
+			if len(filtered_unit) != 2:
+				continue
+			cell_colored, cell_uncolored = filtered_unit
+			if d not in cell_colored.dcs:
+				cell_colored, cell_uncolored = cell_uncolored, cell_colored
+			if d in cell_uncolored.dcs or d not in cell_colored.dcs:
+				continue
+			cell_uncolored.add_color(d, ~cell_colored.dcs[d])
+			colored = True
+	return colored
+
+def medusa_check_cell_contradictions(sudoku, print_start, verbose):
+	for cell in sudoku.cells():
+		colors = list(cell.dcs.values())
+		dup_color = None
+		if colors.count(Color.RED) > 1:
+			dup_color = Color.RED
+		elif colors.count(Color.BLUE) > 1:
+			dup_color = Color.BLUE
+		else:
+			continue
+		if verbose:
+			print_start()
+			print(' - Find a cell with multiple candidates in the same color')
+			dup_candidates = {d for d in cell.dcs if cell.dcs[d] == dup_color}
+			print(' - Cell %s has multiple candidates %s colored %s' %
+				(cell.cell_name(), set_string(dup_candidates), dup_color))
+		return medusa_eliminate_color(sudoku, dup_color, verbose)
+	return False
+
+def medusa_check_unit_contradictions(sudoku, print_start, verbose):
+	for unit_type, i, d in product(Sudoku.UNIT_TYPES, range(sudoku.size), sudoku.values):
+		unit = sudoku.unit(unit_type, i)
+		colors = [c.dcs[d] for c in unit if d in c.dcs]
+		dup_color = Color.NEITHER
+		if colors.count(Color.RED) > 1:
+			dup_color = Color.RED
+		elif colors.count(Color.BLUE) > 1:
+			dup_color = Color.BLUE
+		else:
+			continue
+		if verbose:
+			print_start()
+			print(' - Find a unit with multiple cells with the same candidate in the same color')
+			dup_cell_names = [c.cell_name() for c in unit
+				if c.dcs.get(d, Color.NEITHER) == dup_color]
+			print(' - %s %s has multiple cells (%s) with candidate %d colored %s' %
+				(unit_type.capitalize(), sudoku.unit_name(unit_type, i),
+					', '.join(dup_cell_names), d, dup_color))
+		return medusa_eliminate_color(sudoku, dup_color, verbose)
+	return False
+
+def medusa_check_seen_contradictions(sudoku, print_start, verbose):
+	for cell in sudoku.cells():
+		if cell.dcs:
+			continue
+		seen = sudoku.seen_from(cell.x, cell.y)
+		seen_colors = {d: {c.dcs[d] for c in seen if d in c.dcs} for d in cell.ds}
+		seen_color = None
+		if all(Color.RED in seen_colors[d] for d in cell.ds):
+			seen_color = Color.RED
+		elif all(Color.BLUE in seen_colors[d] for d in cell.ds):
+			seen_color = Color.BLUE
+		else:
+			continue
+		if verbose:
+			print_start()
+			print(' - Find cells that can see all their candidates in the same color')
+			print(' * Cell %s can see all its candidates %s in %s' %
+				(cell.cell_name(), cell.value_string(), seen_color))
+		return medusa_eliminate_color(sudoku, seen_color, verbose)
+	return False
+
+def medusa_eliminate_color(sudoku, color, verbose):
+	if verbose:
+		print(' - Eliminate all candidates colored %s' % color)
+	changed = False
+	for cell in sudoku.cells():
+		for d in cell.dcs:
+			if cell.dcs[d] != color:
+				continue
+			changed |= cell.exclude({d})
+			if verbose:
+				print('    > Cell %s can only be %s' % (cell.cell_name(),
+					cell.value_string()))
+	return changed
+
+def medusa_check_full_cells(sudoku, print_start, verbose):
+	changed = False
+	for cell in sudoku.cells():
+		if len(set(cell.dcs.values())) != 2:
+			continue
+		cell_changed = cell.include_only(cell.dcs.keys())
+		if verbose and cell_changed:
+			if not changed:
+				print_start()
+				print(' - Find cells with candidates in both colors and others uncolored')
+			print('    * Cell %s can only be %s' % (cell.cell_name(),
+				cell.value_string()))
+		changed |= cell_changed
+	return changed
+
+def medusa_check_emptied_cells(sudoku, print_start, verbose):
+	changed = False
+	for cell in sudoku.cells():
+		if cell.solved():
+			continue
+		seen = sudoku.seen_from(cell.x, cell.y)
+		for d in cell.ds - set(cell.dcs):
+			d_colors = {c.dcs[d] for c in seen if d in c.dcs}
+			if len(d_colors) != 2:
+				continue
+			cell_changed = cell.exclude({d})
+			if verbose and cell_changed:
+				if not changed:
+					print_start()
+					print(' - Find cells with an uncolored candidate that can be seen in both colors')
+				print('    * Cell %s can only be %s, since it can see %d in both colors' %
+					(cell.cell_name(), cell.value_string(), d))
+			changed |= cell_changed
+	return changed
+
+def medusa_check_partial_cells(sudoku, print_start, verbose):
+	changed = False
+	for cell in sudoku.cells():
+		if len(cell.dcs) != 1:
+			continue
+		(d_colored, d_color), = cell.dcs.items()
+		seen = sudoku.seen_from(cell.x, cell.y)
+		for d in cell.ds - {d_colored}:
+			if not any(c for c in seen if c.dcs.get(d, Color.NEITHER) == ~d_color):
+				continue
+			cell_changed = cell.exclude({d})
+			if verbose and cell_changed:
+				if not changed:
+					print_start()
+					print(' - Find cells with a candidate in one color that can see it in the other color')
+				print('    * Cell %s can only be %s, since its %d is %s and it can see %d in %s' %
+					(cell.cell_name(), cell.value_string(), d_colored,
+						d_color, d, ~d_color))
+			changed |= cell_changed
+	return changed
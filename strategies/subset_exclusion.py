@@ -0,0 +1,43 @@
+from __future__ import print_function
+
+from utils import *
+from cell import *
+from board import *
+from strategies.common import *
+
+from itertools import product, combinations
+
+@Sudoku.strategy('2-cell subset exclusion', 21)
+def solve_2_cell_subset_exclusion(sudoku, verbose):
+	"""Find a pair of cells that would lead to a contradiction if one of them
+	actually were a certain candidate, and exclude that candidate."""
+	return solve_n_cell_subset_exclusion(sudoku, 2, verbose)
+
+@Sudoku.strategy('3-cell subset exclusion', 22)
+def solve_3_cell_subset_exclusion(sudoku, verbose):
+	"""Find a triple of cells that would lead to a contradiction if one of them
+	actually were a certain candidate, and exclude that candidate."""
+	return solve_n_cell_subset_exclusion(sudoku, 3, verbose)
+
+def solve_n_cell_subset_exclusion(sudoku, n, verbose):
+	changed = False
+	unsolved_cells = [c for c in sudoku.cells() if not c.solved()]
+	for subset in combinations(unsolved_cells, n):
+		seen = intersection(sudoku.seen_from(c.x, c.y) for c in subset)
+		# TODO: remove impossible assignments that assign the same value to
+		# cells in the subset that can see each other
+		assignments = [a for a in product(*[c.ds for c in subset])
+			if not any(c.ds.issubset(a) for c in seen)]
+		for cell, ds in zip(subset, transpose(assignments)):
+			if not cell.include_only(ds):
+				continue
+			if verbose:
+				print(' * Cell %s of (%s) can only be %s' % (cell.cell_name(),
+					', '.join(c.cell_name() for c in subset),
+					cell.value_string()))
+			sudoku.deduced(subset)
+			if not sudoku.exhaustive:
+				return True
+			strip_all_naked_singles(sudoku, verbose)
+			changed = True
+	return changed
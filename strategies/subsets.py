@@ -0,0 +1,141 @@
+from __future__ import print_function
+
+from utils import *
+from cell import *
+from board import *
+from strategies.common import *
+
+from itertools import product, combinations
+
+@Sudoku.strategy('naked singles', 1)
+def solve_strip_naked_singles(sudoku, verbose):
+	"""Exclude the values of seen solved cells as candidates for unsolved cells."""
+	return any([solve_strip_naked_single(sudoku, x, y, verbose)
+		for y, x in product(range(sudoku.size), range(sudoku.size))])
+
+@Sudoku.strategy('naked pairs', 3)
+def solve_naked_pairs(sudoku, verbose):
+	"""Exclude the candidates of seen bi-value cell pairs from unsolved cells
+	in their unit."""
+	return solve_naked_n_tuples(sudoku, 2, verbose)
+
+@Sudoku.strategy('naked triples', 5)
+def solve_naked_triples(sudoku, verbose):
+	"""Exclude the candidates of seen tri-value cell triples from unsolved cells
+	in their unit."""
+	return solve_naked_n_tuples(sudoku, 3, verbose)
+
+@Sudoku.strategy('naked quads', 7)
+def solve_naked_quads(sudoku, verbose):
+	"""Exclude the candidates of seen quad-value cell quads from unsolved cells
+	in their unit."""
+	return solve_naked_n_tuples(sudoku, 4, verbose)
+
+def solve_naked_n_tuples(sudoku, n, verbose):
+	return any([solve_naked_n_tuples_in_unit(sudoku, unit_type, n, i, verbose)
+		for unit_type, i in product(Sudoku.UNIT_TYPES, range(sudoku.size))])
+
+def solve_naked_n_tuples_in_unit(sudoku, unit_type, n, i, verbose):
+	unit = sudoku.unit(unit_type, i)
+	filtered_unit = [c for c in unit if 2 <= len(c.ds) <= n]
+	return solve_naked_n_tuples_from(sudoku, unit_type, n, i, filtered_unit, [], 0, 0, verbose)
+
+def solve_naked_n_tuples_from(sudoku, unit_type, n, i, filtered_unit, cells, mask, start, verbose):
+	"""Find naked n-tuples that add cells after the start of the filtered unit
+	to the given ones (with combined candidates mask), skipping every superset
+	of a subset whose candidates already number more than n."""
+	changed = False
+	for j in range(start, len(filtered_unit)):
+		subset_mask = mask | filtered_unit[j].mask
+		if popcount(subset_mask) > n:
+			continue
+		subset = cells + [filtered_unit[j]]
+		if len(subset) < n:
+			changed |= solve_naked_n_tuples_from(sudoku, unit_type, n, i,
+				filtered_unit, subset, subset_mask, j + 1, verbose)
+			continue
+		if popcount(subset_mask) != n:
+			continue
+		candidates = bitmask_values(subset_mask)
+		unit_changed = False
+		for cell in sudoku.unit(unit_type, i):
+			if cell.mask & subset_mask and cell not in subset:
+				unit_changed |= cell.exclude(candidates)
+		changed |= unit_changed
+		if verbose and unit_changed:
+			print(' * In %s %s, cells (%s) can only be %s' %
+				(unit_type, sudoku.unit_name(unit_type, i),
+					', '.join(c.cell_name() for c in subset),
+					set_string(candidates)))
+		if unit_changed:
+			sudoku.deduced(subset)
+	return changed
+
+@Sudoku.strategy('hidden singles', 2)
+def solve_hidden_singles(sudoku, verbose):
+	"""Find cells with a unique candidate in a unit and set them to that value."""
+	return solve_hidden_n_tuples(sudoku, 1, verbose)
+
+@Sudoku.strategy('hidden pairs', 4)
+def solve_hidden_pairs(sudoku, verbose):
+	"""Find pairs of cells with two unique candidates in a unit and limit them
+	to those candidates."""
+	return solve_hidden_n_tuples(sudoku, 2, verbose)
+
+@Sudoku.strategy('hidden triples', 6)
+def solve_hidden_triples(sudoku, verbose):
+	"""Find triples of cells with three unique candidates in a unit and limit them
+	to those candidates."""
+	return solve_hidden_n_tuples(sudoku, 3, verbose)
+
+@Sudoku.strategy('hidden quads', 8)
+def solve_hidden_quads(sudoku, verbose):
+	"""Find quads of cells with four unique candidates in a unit and limit them
+	to those candidates."""
+	return solve_hidden_n_tuples(sudoku, 4, verbose)
+
+def solve_hidden_n_tuples(sudoku, n, verbose):
+	return any([solve_hidden_n_tuples_in_unit(sudoku, unit_type, n, i, verbose)
+		for unit_type, i in product(Sudoku.UNIT_TYPES, range(sudoku.size))])
+
+def solve_hidden_n_tuples_in_unit(sudoku, unit_type, n, i, verbose):
+	changed = False
+	while solve_hidden_n_tuples_in_unit_once(sudoku, unit_type, n, i, verbose):
+		changed = True
+	return changed
+
+def solve_hidden_n_tuples_in_unit_once(sudoku, unit_type, n, i, verbose):
+	changed = False
+	unit = sudoku.unit(unit_type, i)
+	locations = sudoku.unit_locations(unit_type, i)
+	unsolved = bitmask(p for p, c in enumerate(unit) if not c.solved())
+	filtered_ds = [d for d in sudoku.values if locations[d] and not locations[d] & ~unsolved]
+	for ds in combinations(filtered_ds, n):
+		positions = 0
+		for d in ds:
+			positions |= locations[d]
+		if popcount(positions) != n or not all(locations[d] for d in ds):
+			continue
+		if len([d for d in filtered_ds if locations[d] and not locations[d] & ~positions]) != n:
+			continue
+		cells = [unit[p] for p in bitmask_values(positions)]
+		if any(c.solved() for c in cells):
+			continue
+		subset_changed = False
+		for cell in cells:
+			subset_changed |= cell.include_only(ds)
+		changed |= subset_changed
+		if verbose and subset_changed:
+			if n == 1:
+				cell = cells[0]
+				print(' * In %s %s, only cell %s can be %s' %
+					(unit_type, sudoku.unit_name(unit_type, i),
+						cell.cell_name(), cell.value()))
+			else:
+				print(' * In %s %s, only cells (%s) can be %s' %
+					(unit_type, sudoku.unit_name(unit_type, i),
+						', '.join(c.cell_name() for c in cells),
+						set_string(ds)))
+		if subset_changed:
+			sudoku.deduced(cells)
+	return changed
@@ -0,0 +1,221 @@
+from __future__ import print_function
+
+from utils import *
+from cell import *
+from board import *
+from strategies.common import *
+
+from itertools import product, combinations
+
+@Sudoku.strategy('unique rectangle type 1', 16.1, uniqueness=True)
+def solve_unique_rectangles_type_1(sudoku, verbose):
+	"""Find a rectangle of cells in two rows, two columns, and two blocks that
+	all have candidates {X, Y}, three of which have only those; and exclude X
+	and Y from the fourth cell, since otherwise X and Y could be swapped to give
+	the board two solutions."""
+	return solve_from_each(sudoku, solve_unique_rectangle_type_1_from,
+		unique_rectangles(sudoku), verbose)
+
+def solve_unique_rectangle_type_1_from(sudoku, p, q, x1, y1, x2, y2, verbose):
+	corners = unique_rectangle_corners(sudoku, p, q, x1, y1, x2, y2)
+	roof = [c for c in corners if not c.bi_value()]
+	if len(roof) != 1:
+		return False
+	cell, = roof
+	cell.exclude({p, q})
+	if verbose:
+		unique_rectangle_print(p, q, corners)
+		print('    > Cell %s can only be %s' % (cell.cell_name(), cell.value_string()))
+	sudoku.deduced(corners)
+	return True
+
+@Sudoku.strategy('unique rectangle type 2', 16.2, uniqueness=True)
+def solve_unique_rectangles_type_2(sudoku, verbose):
+	"""Find a rectangle of cells in two rows, two columns, and two blocks that
+	all have candidates {X, Y}, where two in one unit have only those and the
+	other two have only {X, Y, Z}; and exclude Z from any cells that can see
+	both of the other two, since one of them must be Z."""
+	return solve_from_each(sudoku, solve_unique_rectangle_type_2_from,
+		unique_rectangles(sudoku), verbose)
+
+def solve_unique_rectangle_type_2_from(sudoku, p, q, x1, y1, x2, y2, verbose):
+	corners = unique_rectangle_corners(sudoku, p, q, x1, y1, x2, y2)
+	roof = unique_rectangle_roof(corners)
+	if not roof:
+		return False
+	extras = union(c.ds for c in roof) - {p, q}
+	if len(extras) != 1:
+		return False
+	r, = extras
+	cells = (sudoku.peers[sudoku.cell_index(roof[0])] & sudoku.peers[sudoku.cell_index(roof[1])] &
+		sudoku.candidate_cells[r])
+	cells = [c for c in sudoku.cells_in(cells) if not c.solved()]
+	if not cells:
+		return False
+	if verbose:
+		unique_rectangle_print(p, q, corners)
+	for cell in cells:
+		cell.exclude({r})
+		if verbose:
+			print('    > Cell %s can only be %s' % (cell.cell_name(), cell.value_string()))
+	sudoku.deduced(corners)
+	return True
+
+@Sudoku.strategy('unique rectangle type 3', 16.3, uniqueness=True)
+def solve_unique_rectangles_type_3(sudoku, verbose):
+	"""Find a rectangle of cells in two rows, two columns, and two blocks that
+	all have candidates {X, Y}, where two in one unit have only those; and treat
+	the other two as one cell with their other candidates, since one of them
+	must be one of those, to find a naked subset in a unit that they share."""
+	return solve_from_each(sudoku, solve_unique_rectangle_type_3_from,
+		unique_rectangles(sudoku), verbose)
+
+def solve_unique_rectangle_type_3_from(sudoku, p, q, x1, y1, x2, y2, verbose):
+	corners = unique_rectangle_corners(sudoku, p, q, x1, y1, x2, y2)
+	roof = unique_rectangle_roof(corners)
+	if not roof:
+		return False
+	extras = union(c.ds for c in roof) - {p, q}
+	if len(extras) < 2:
+		return False
+	for u in unique_rectangle_roof_units(sudoku, roof):
+		unit_type = Sudoku.UNIT_TYPES[u // sudoku.size]
+		others = [c for c in sudoku.cells_in(sudoku.unit_cells[u])
+			if not c.solved() and c not in roof]
+		for n in range(1, min(4, len(others))):
+			for subset in combinations(others, n):
+				ds = union(c.ds for c in subset) | extras
+				if len(ds) != n + 1:
+					continue
+				cells = [c for c in others if c not in subset and c.ds & ds]
+				if not cells:
+					continue
+				if verbose:
+					unique_rectangle_print(p, q, corners)
+					print(' - In %s %s, cells %s and %s are a naked %s of %s with cells %s' %
+						(unit_type, sudoku.unit_name(unit_type, u % sudoku.size),
+							roof[0].cell_name(), roof[1].cell_name(), n_tuple_name(n + 1),
+							set_string(ds), ', '.join(c.cell_name() for c in subset)))
+				for cell in cells:
+					cell.exclude(ds)
+					if verbose:
+						print('    > Cell %s can only be %s' %
+							(cell.cell_name(), cell.value_string()))
+				sudoku.deduced(corners + list(subset))
+				return True
+	return False
+
+@Sudoku.strategy('unique rectangle type 4', 16.4, uniqueness=True)
+def solve_unique_rectangles_type_4(sudoku, verbose):
+	"""Find a rectangle of cells in two rows, two columns, and two blocks that
+	all have candidates {X, Y}, where two in one unit have only those and the
+	other two are the only cells in a unit with X; and exclude Y from the other
+	two, since one of them must be X."""
+	return solve_from_each(sudoku, solve_unique_rectangle_type_4_from,
+		unique_rectangles(sudoku), verbose)
+
+def solve_unique_rectangle_type_4_from(sudoku, p, q, x1, y1, x2, y2, verbose):
+	corners = unique_rectangle_corners(sudoku, p, q, x1, y1, x2, y2)
+	roof = unique_rectangle_roof(corners)
+	if not roof:
+		return False
+	cells = 1 << sudoku.cell_index(roof[0]) | 1 << sudoku.cell_index(roof[1])
+	for u in unique_rectangle_roof_units(sudoku, roof):
+		unit_type = Sudoku.UNIT_TYPES[u // sudoku.size]
+		for d, e in [(p, q), (q, p)]:
+			if sudoku.candidate_cells[d] & sudoku.unit_cells[u] & ~cells:
+				continue
+			for cell in roof:
+				cell.exclude({e})
+			if verbose:
+				unique_rectangle_print(p, q, corners)
+				print(' - In %s %s, %d can only be in cells %s and %s' %
+					(unit_type, sudoku.unit_name(unit_type, u % sudoku.size), d,
+						roof[0].cell_name(), roof[1].cell_name()))
+				for cell in roof:
+					print('    > Cell %s can only be %s' %
+						(cell.cell_name(), cell.value_string()))
+			sudoku.deduced(corners)
+			return True
+	return False
+
+def unique_rectangles(sudoku):
+	"""Return the candidates (p, q) and opposite corners (x1, y1) and (x2, y2)
+	of each rectangle of unsolved cells in two rows, two columns, and two blocks
+	that all have candidates p and q, one or more of which have only those."""
+	rectangles = []
+	for cell in sudoku.cells():
+		if not cell.bi_value():
+			continue
+		p, q = sorted(cell.ds)
+		cells = sudoku.candidate_cells[p] & sudoku.candidate_cells[q]
+		row_cells = sudoku.cells_in(cells & sudoku.unit_cells[cell.y])
+		col_cells = sudoku.cells_in(cells & sudoku.unit_cells[sudoku.size + cell.x])
+		for row_cell, col_cell in product(row_cells, col_cells):
+			if row_cell is cell or col_cell is cell:
+				continue
+			corner = sudoku.cell(row_cell.x, col_cell.y)
+			if not cells >> sudoku.cell_index(corner) & 1:
+				continue
+			if len({cell.b, row_cell.b, col_cell.b, corner.b}) != 2:
+				continue
+			rectangle = (p, q, min(cell.x, corner.x), min(cell.y, corner.y),
+				max(cell.x, corner.x), max(cell.y, corner.y))
+			if rectangle not in rectangles:
+				rectangles.append(rectangle)
+	return rectangles
+
+def unique_rectangle_corners(sudoku, p, q, x1, y1, x2, y2):
+	"""Return the corners of a rectangle, or no corners if they do not all
+	have candidates p and q any more."""
+	corners = [sudoku.cell(x1, y1), sudoku.cell(x2, y1), sudoku.cell(x1, y2), sudoku.cell(x2, y2)]
+	if not all({p, q} <= c.ds for c in corners):
+		return []
+	return corners
+
+def unique_rectangle_roof(corners):
+	"""Return the two corners of a rectangle that have other candidates, if the
+	two that only have its candidates are in one row or column."""
+	floor = [c for c in corners if c.bi_value()]
+	if len(floor) != 2 or (floor[0].x != floor[1].x and floor[0].y != floor[1].y):
+		return []
+	return [c for c in corners if not c.bi_value()]
+
+def unique_rectangle_roof_units(sudoku, roof):
+	"""Return the indexes of the units that two corners of a rectangle share."""
+	units = [u for u, _ in sudoku.unit_positions(roof[1])]
+	return [u for u, _ in sudoku.unit_positions(roof[0]) if u in units]
+
+def unique_rectangle_print(p, q, corners):
+	print(' - Unique rectangle of %s at cells %s' %
+		(set_string({p, q}), ', '.join(c.cell_name() for c in corners)))
+
+@Sudoku.strategy('BUG+1', 16.5, uniqueness=True)
+def solve_bug_plus_1(sudoku, verbose):
+	"""Find a "bivalent universal grave" plus one cell: every unsolved cell has
+	two candidates except for one with three, and every unit has each unsolved
+	candidate in two cells except for one candidate of that cell, which is in
+	three cells of each of its units. Then that cell must be that candidate,
+	since otherwise the board would have two solutions."""
+	unsolved = [c for c in sudoku.cells() if not c.solved()]
+	tri_value = [c for c in unsolved if not c.bi_value()]
+	if len(tri_value) != 1 or len(tri_value[0].ds) != 3:
+		return False
+	cell, = tri_value
+	units = [u for u, _ in sudoku.unit_positions(cell)]
+	triples = [d for d in cell.ds
+		if popcount(sudoku.locations[cell.y][d] & ~sudoku.solved_positions[cell.y]) == 3]
+	if len(triples) != 1:
+		return False
+	d, = triples
+	for u, e in product(range(3 * sudoku.size), sudoku.values):
+		n = popcount(sudoku.locations[u][e] & ~sudoku.solved_positions[u])
+		if n not in [0, 3 if u in units and e == d else 2]:
+			return False
+	cell.include_only({d})
+	if verbose:
+		print(' - BUG+1 at cell %s, where %d is in three cells of each unit' %
+			(cell.cell_name(), d))
+		print('    > Cell %s can only be %s' % (cell.cell_name(), cell.value_string()))
+	sudoku.deduced(unsolved)
+	return True
@@ -0,0 +1,86 @@
+from __future__ import print_function
+
+from utils import *
+from cell import *
+from board import *
+from strategies.common import *
+
+from itertools import product
+
+@Sudoku.strategy('Y-wing', 11)
+def solve_y_wings(sudoku, verbose):
+	"""Find a "hinge" cell with candidates {X, Y}, that can see two "wing" cells
+	with candidates {X, Z} and {Y, Z}, such that the wings cannot see each other;
+	and exclude Z from any cells that can see both wings."""
+	return solve_from_each(sudoku, solve_y_wing_from,
+		[(x, y) for y, x in product(range(sudoku.size), range(sudoku.size))], verbose)
+
+def solve_y_wing_from(sudoku, x, y, verbose):
+	hinge = sudoku.cell(x, y)
+	if not hinge.bi_value():
+		return False
+	p, q = sorted(hinge.ds)
+	seen = sudoku.peers[sudoku.cell_index(hinge)]
+	for r in sudoku.values:
+		if r in [p, q]:
+			continue
+		wing1s = sudoku.cells_in(sudoku.cells_with_candidates({p, r}) & seen)
+		wing2s = sudoku.cells_in(sudoku.cells_with_candidates({q, r}) & seen)
+		for wing1, wing2 in product(wing1s, wing2s):
+			cells = sudoku.peers[sudoku.cell_index(wing1)]
+			if cells >> sudoku.cell_index(wing2) & 1:
+				continue
+			cells &= sudoku.peers[sudoku.cell_index(wing2)] & sudoku.candidate_cells[r]
+			cells = [c for c in sudoku.cells_in(cells) if not c.solved()]
+			if not cells:
+				continue
+			if verbose:
+				print(' - Y-wing with hinge at cell %s %s and wings at %s %s and %s %s' %
+					(hinge.cell_name(), hinge.value_string(), wing1.cell_name(),
+					wing1.value_string(), wing2.cell_name(), wing2.value_string()))
+			for cell in cells:
+				cell.exclude({r})
+				if verbose:
+					print('    > Cell %s can only be %s' %
+						(cell.cell_name(), cell.value_string()))
+			sudoku.deduced([hinge, wing1, wing2])
+			return True
+	return False
+
+@Sudoku.strategy('XYZ-wing', 13)
+def solve_xyz_wings(sudoku, verbose):
+	"""Find a "hinge" cell with candidates {X, Y, Z}, that can see two "wing"
+	cells with candidates {X, Z} and {Y, Z}, such that the wings cannot see each
+	other; and exclude Z from any cells that can see both wings and the hinge."""
+	return solve_from_each(sudoku, solve_xyz_wing_from,
+		[(x, y) for y, x in product(range(sudoku.size), range(sudoku.size))], verbose)
+
+def solve_xyz_wing_from(sudoku, x, y, verbose):
+	hinge = sudoku.cell(x, y)
+	if len(hinge.ds) != 3:
+		return False
+	seen = sudoku.peers[sudoku.cell_index(hinge)]
+	for r in sorted(hinge.ds):
+		p, q = sorted(hinge.ds - {r})
+		wing1s = sudoku.cells_in(sudoku.cells_with_candidates({p, r}) & seen)
+		wing2s = sudoku.cells_in(sudoku.cells_with_candidates({q, r}) & seen)
+		for wing1, wing2 in product(wing1s, wing2s):
+			cells = sudoku.peers[sudoku.cell_index(wing1)]
+			if cells >> sudoku.cell_index(wing2) & 1:
+				continue
+			cells &= sudoku.peers[sudoku.cell_index(wing2)] & seen & sudoku.candidate_cells[r]
+			cells = [c for c in sudoku.cells_in(cells) if not c.solved()]
+			if not cells:
+				continue
+			if verbose:
+				print(' - XYZ-wing with hinge at cell %s %s and wings at %s %s and %s %s' %
+					(hinge.cell_name(), hinge.value_string(), wing1.cell_name(),
+					wing1.value_string(), wing2.cell_name(), wing2.value_string()))
+			for cell in cells:
+				cell.exclude({r})
+				if verbose:
+					print('    > Cell %s can only be %s' %
+						(cell.cell_name(), cell.value_string()))
+			sudoku.deduced([hinge, wing1, wing2])
+			return True
+	return False
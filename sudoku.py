@@ -1,42 +1,240 @@
-#!/usr/bin/python
+#!/usr/bin/env python
 
 from __future__ import print_function
 
 from board import Sudoku
 from strategies import *
 
-from argparse import ArgumentParser
+# The modules that only some commands need (for files of boards, worker
+# processes, serving, or tracing) are imported where they are used, so that
+# solving a single board starts up quickly
+
+from argparse import ArgumentParser, ArgumentTypeError
+from collections import Counter
+from contextlib import closing
+from timeit import default_timer
+import json
+import os
 import sys
 
-def solve_board(board, guess, verbose):
+def solve_board(board, guess, verbose, exhaustive=False):
 	"""Solve a single board."""
 	board = Sudoku(board)
+	board.exhaustive = exhaustive
 	exclude = None if guess else [999]
 	board.solve(exclude=exclude, verbose=verbose)
 	board.verify()
 
-def solve_boards(file, guess, verbose):
-	"""Solve each board in a text file."""
-	if verbose:
-		print('#', 'solved?', 'board', 'strategy', sep='\t')
-	exclude = None if guess else [999]
-	with open(file, 'r') as boards:
-		for line in boards:
-			line = line.strip()
+def read_boards(file, shard=None):
+	"""Yield each board in a text or packed file, with its text form.
+
+	If shard is given as (k, n), only yield the boards in shard k of n
+	(numbered from 1). Text files are split by byte offset, and each board
+	belongs to the shard where its line starts, so a shard can be read
+	without reading the ones before it."""
+	from packed import is_packed, read_packed_boards
+	if is_packed(file):
+		for line, board in read_packed_boards(file, shard):
+			yield line, board
+		return
+	for line in read_board_lines(file, shard):
+		try:
+			board = Sudoku(line)
+		except ValueError as e:
+			print('*** ERROR:', line, e)
+			continue
+		yield line, board
+
+def read_board_lines(file, shard=None):
+	"""Yield the text of each board in a text file, or only those in shard k
+	of n if shard is given as (k, n), as read_boards does."""
+	with open(file, 'rb') as boards:
+		start, stop = 0, None
+		if shard:
+			k, n = shard
+			size = os.fstat(boards.fileno()).st_size
+			start, stop = size * (k - 1) // n, size * k // n
+		if start:
+			boards.seek(start - 1)
+			boards.readline()
+		while stop is None or boards.tell() < stop:
+			line = boards.readline()
+			if not line:
+				break
+			line = str(line.decode('ascii')).strip()
 			if not line or line.startswith('#'):
 				continue
-			board = Sudoku(line)
-			n = board.num_solved()
+			yield line
+
+def count_boards(file, shard=None):
+	"""Return how many boards read_boards would yield, without parsing them."""
+	from packed import is_packed, PackedBoards
+	if is_packed(file):
+		with closing(PackedBoards(file)) as boards:
+			start, stop = boards.shard(shard)
+		return stop - start
+	return sum(1 for _ in read_board_lines(file, shard))
+
+def print_result(result, json_output):
+	"""Print the result of solving one board as tab-separated or JSON data."""
+	if json_output:
+		print(json.dumps(result, sort_keys=True))
+	else:
+		print(result['solved_cells'], 'TRUE' if result['solved'] else 'FALSE',
+			result['board'], result['strategy'], sep='\t')
+
+def solve_boards(file, guess, verbose, shard=None, json_output=False, exhaustive=False,
+	progress=None):
+	"""Solve each board in a text or packed file, recording each one with a
+	Progress if one is given."""
+	if verbose and not json_output:
+		print('#', 'solved?', 'board', 'strategy', sep='\t')
+	exclude = None if guess else [999]
+	for line, board in read_boards(file, shard):
+		board.exhaustive = exhaustive
+		n = board.num_solved()
+		start = default_timer()
+		try:
 			hardest = board.solve(exclude=exclude)
+			board.verify()
+		except RuntimeError:
+			print('*** ERROR:', line)
+			board = Sudoku(line)
+			board.exhaustive = exhaustive
 			try:
-				board.verify()
-			except:
-				print('*** ERROR:', line)
-				Sudoku(line).solve(exclude=exclude, verbose=True)
-				break
-			if verbose:
-				print(board.num_solved() - n, 'TRUE' if board.solved() else 'FALSE',
-					line, hardest, sep='\t')
+				board.solve(exclude=exclude, verbose=True)
+			except Contradiction as e:
+				print('***', e)
+			break
+		if progress:
+			progress.update(default_timer() - start, board.solved(), hardest)
+		if verbose:
+			print_result({'solved_cells': board.num_solved() - n, 'solved': board.solved(),
+				'board': line, 'strategy': hardest}, json_output)
+	if progress:
+		progress.summary()
+
+def solve_boards_longest_first(file, guess, verbose, shard=None, json_output=False,
+	exhaustive=False, progress=None, workers=None, costs=None):
+	"""Solve each board in a text or packed file with a pool of workers,
+	starting with the boards that should take longest, and output the results
+	in the order of the file. costs maps boards to their cost from an earlier
+	run, as read_costs returns."""
+	from packed import is_packed, read_packed_records, digits_line
+	from ordering import solve_longest_first
+	from shared import (shared_memory, solve_longest_first_shared, line_grids,
+		packed_grids)
+	if verbose and not json_output:
+		print('#', 'solved?', 'board', 'strategy', sep='\t')
+	# Boards go to the workers through shared memory a chunk at a time where it
+	# is supported, and packed boards go there without being parsed as text
+	if shared_memory:
+		boards = (packed_grids(file, shard) if is_packed(file) else
+			line_grids(read_board_lines(file, shard)))
+		solved = solve_longest_first_shared(boards, guess, exhaustive, workers, costs)
+	else:
+		if is_packed(file):
+			lines = [digits_line(digits) for digits in read_packed_records(file, shard)]
+		else:
+			lines = list(read_board_lines(file, shard))
+		solved = solve_longest_first(lines, guess, exhaustive, workers, costs)
+	for line, result, error, seconds in solved:
+		if error:
+			print('*** ERROR:', line, error)
+			continue
+		if progress:
+			progress.update(seconds, result['solved'], result['strategy'])
+		if verbose:
+			print_result(result, json_output)
+	if progress:
+		progress.summary()
+
+def solve_boards_in_tiers(file, guess, verbose, shard=None, json_output=False, workers=None):
+	"""Solve each board in a text or packed file through a pipeline of tiers
+	of strategies, outputting each result as soon as its board leaves it,
+	followed by how many boards left after each tier."""
+	if verbose and not json_output:
+		print('#', 'solved?', 'board', 'strategy', sep='\t')
+	def report(line, result, error):
+		if error:
+			print('*** ERROR:', line, error)
+		elif verbose:
+			print_result(result, json_output)
+			sys.stdout.flush()
+	from pipeline import Pipeline
+	pipeline = Pipeline(report, guess, workers)
+	for line, board in read_boards(file, shard):
+		pipeline.submit(line, board.num_solved())
+	pipeline.join()
+	if not verbose:
+		return
+	if json_output:
+		print(json.dumps({'summary': {'tiers': [{'tier': name, 'exits': n}
+			for name, n in pipeline.tier_exits()]}}, sort_keys=True))
+		return
+	for name, n in pipeline.tier_exits():
+		print('# tier', name, n, sep='\t')
+
+def read_results(file):
+	"""Yield each result in a tab-separated or JSON output file of solve_boards."""
+	with open(file, 'r') as results:
+		for line in results:
+			line = line.strip()
+			if line.startswith('{'):
+				result = json.loads(line)
+				if 'summary' not in result:
+					yield result
+				continue
+			fields = line.split('\t')
+			if line.startswith('#') or len(fields) != 4:
+				continue
+			n, solved, board, strategy = fields
+			yield {'solved_cells': int(n), 'solved': solved == 'TRUE',
+				'board': board, 'strategy': strategy}
+
+def read_costs(files):
+	"""Return the cost of each board in output files of solve_boards: the
+	difficulty of the hardest strategy it used, or UNSOLVED_COST if it was
+	not solved."""
+	from ordering import UNSOLVED_COST
+	difficulties = {strategy.name: difficulty
+		for difficulty, strategy in Sudoku.strategies.items()}
+	return {result['board']: difficulties.get(result['strategy'], 0)
+		if result['solved'] else UNSOLVED_COST
+		for file in files for result in read_results(file)}
+
+def merge_results(files, json_output):
+	"""Combine the outputs of solving several shards into one, followed by a
+	summary of how many boards were solved and with which strategies."""
+	if not json_output:
+		print('#', 'solved?', 'board', 'strategy', sep='\t')
+	num_boards = num_solved = 0
+	strategies = Counter()
+	for file in files:
+		for result in read_results(file):
+			print_result(result, json_output)
+			num_boards += 1
+			num_solved += result['solved']
+			strategies[result['strategy']] += 1
+	if json_output:
+		print(json.dumps({'summary': {'boards': num_boards, 'solved': num_solved,
+			'strategies': dict(strategies)}}, sort_keys=True))
+		return
+	print('# boards', num_boards, sep='\t')
+	print('# solved', num_solved, sep='\t')
+	for difficulty, strategy in sorted(Sudoku.strategies.items()):
+		if strategies[strategy.name]:
+			print('# strategy', strategy.name, strategies[strategy.name], sep='\t')
+
+def shard_arg(s):
+	"""Parse a shard given as "K/N" into (K, N)."""
+	try:
+		k, n = map(int, s.split('/'))
+	except ValueError:
+		raise ArgumentTypeError('shard must be K/N, not %r' % s)
+	if not 1 <= k <= n:
+		raise ArgumentTypeError('shard K/N must have 1 <= K <= N, not %r' % s)
+	return k, n
 
 def main():
 	parser = ArgumentParser(description='Human-style Sudoku solver')
@@ -44,17 +242,92 @@ def main():
 		help='allow guessing to solve')
 	parser.add_argument('-q', '--quiet', action='store_true',
 		help='solve a board without printing anything')
+	parser.add_argument('-x', '--exhaustive', action='store_true',
+		help='apply every elimination a strategy can find before starting over from the easiest one')
+	parser.add_argument('-n', '--not-unique', action='store_true',
+		help='do not assume that boards have a unique solution, as unique rectangles and BUG+1 do')
 	parser.add_argument('-f', '--file',
-		help='solve each board in a text file and output overall results as tab-separated data')
+		help='solve each board in a text or packed file and output overall results as tab-separated data')
+	parser.add_argument('--progress', type=float, default=10.0, metavar='SECONDS',
+		help='report progress to stderr this often while solving the file given with -f, '
+			'and a summary at the end (default: 10; 0 for only the summary)')
+	parser.add_argument('--tiers', action='store_true',
+		help='solve the file given with -f through a pipeline of tiers of strategies, each with its own workers')
+	parser.add_argument('--longest-first', action='store_true',
+		help='solve the file given with -f with a pool of workers, starting with the boards '
+			'that should take longest, and output results in the order of the file')
+	parser.add_argument('--costs', nargs='+', metavar='RESULTS',
+		help='outputs of earlier runs that give how hard each board is for --longest-first '
+			'(by default, it is estimated from the candidates left after solving up to unit '
+			'intersections)')
+	parser.add_argument('--shard', type=shard_arg, metavar='K/N',
+		help='only solve shard K of N of the file given with -f')
+	parser.add_argument('-j', '--json', action='store_true',
+		help='output results as newline-delimited JSON instead of tab-separated data')
+	parser.add_argument('-m', '--merge', nargs='+', metavar='RESULTS',
+		help='combine the outputs of solving several shards and summarize them')
+	parser.add_argument('-p', '--pack', metavar='OUTFILE',
+		help='convert the text file of boards given with -f into a packed binary file')
+	parser.add_argument('-s', '--serve', metavar='ADDRESS',
+		help='serve newline-delimited JSON solve requests on a Unix socket path or a TCP [HOST:]PORT')
+	parser.add_argument('-w', '--workers', type=int,
+		help='number of worker processes for serving, for each tier, or for solving longest '
+			'first (default: one per CPU)')
+	parser.add_argument('--parallel', type=int, metavar='WORKERS',
+		help='search the starting points of forcing chains and 3D Medusas with a pool of worker processes')
+	parser.add_argument('-t', '--trace', metavar='OUTFILE',
+		help='write the time spent in each strategy as collapsed stacks for flame graphs')
+	parser.add_argument('--trace-rate', type=float, default=1.0, metavar='RATE',
+		help='fraction of strategy calls to trace (default: 1, all of them)')
 	parser.add_argument('BOARD', nargs='?',
 		help='a single board to solve')
 	args = vars(parser.parse_args())
+	sampler = None
+	if args['trace']:
+		from tracing import StackSampler
+		sampler = StackSampler(args['trace_rate'])
+		Sudoku.hooks.append(sampler)
+	if args['not_unique']:
+		Sudoku.unique = False
+	if args['parallel']:
+		from parallel import StartPool
+		Sudoku.pool = StartPool(args['parallel'])
 	if args['BOARD']:
-		solve_board(args['BOARD'], args['guess'], not args['quiet'])
+		solve_board(args['BOARD'], args['guess'], not args['quiet'], args['exhaustive'])
+	elif args['file'] and args['pack']:
+		from packed import pack_boards
+		n, errors = pack_boards(args['file'], args['pack'])
+		for line, error in errors:
+			print('*** ERROR:', line, error)
+		if not args['quiet']:
+			print('Packed', n, 'boards into', args['pack'])
+	elif args['file'] and args['tiers']:
+		solve_boards_in_tiers(args['file'], args['guess'], not args['quiet'], args['shard'],
+			args['json'], args['workers'])
 	elif args['file']:
-		solve_boards(args['file'], args['guess'], not args['quiet'])
+		progress = None
+		if not args['quiet']:
+			from progress import Progress
+			progress = Progress(count_boards(args['file'], args['shard']), args['progress'])
+		if args['longest_first']:
+			solve_boards_longest_first(args['file'], args['guess'], not args['quiet'],
+				args['shard'], args['json'], args['exhaustive'], progress, args['workers'],
+				read_costs(args['costs'] or []))
+		else:
+			solve_boards(args['file'], args['guess'], not args['quiet'], args['shard'],
+				args['json'], args['exhaustive'], progress)
+	elif args['merge']:
+		merge_results(args['merge'], args['json'])
+	elif args['serve']:
+		from server import serve
+		serve(args['serve'], args['workers'], args['guess'])
 	else:
 		parser.print_usage()
+	if Sudoku.pool:
+		Sudoku.pool.close()
+	if sampler:
+		with open(args['trace'], 'w') as trace:
+			sampler.write(trace)
 
 if __name__ == '__main__':
 	main()
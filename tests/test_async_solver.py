@@ -0,0 +1,63 @@
+from __future__ import print_function
+
+from board import Sudoku
+from strategies import *
+
+import unittest
+
+try:
+	import asyncio
+	from async_solver import solve_async, solve_in_executor
+except (ImportError, SyntaxError):
+	asyncio = None
+
+# Solved with naked and hidden singles
+EASY = '003020600900305001001806400008102900700000008006708200002609500800203009005010300'
+
+# Needs strategies beyond unit intersections
+HARD = '000000000000001002034000050000020030100006000700000000000300001000540000200000089'
+
+def run(coroutine):
+	loop = asyncio.new_event_loop()
+	try:
+		return loop.run_until_complete(coroutine)
+	finally:
+		loop.close()
+
+@unittest.skipIf(asyncio is None, 'asyncio needs Python 3')
+class AsyncSolverTest(unittest.TestCase):
+
+	def check_same_as_solve(self, solve, line, **limits):
+		expected = Sudoku(line)
+		strategy = expected.solve(**limits)
+		board = Sudoku(line)
+		self.assertEqual(run(solve(board, **limits)), strategy)
+		self.assertEqual(board.code_str(), expected.code_str())
+
+	def test_solve_async(self):
+		self.check_same_as_solve(solve_async, EASY)
+		self.check_same_as_solve(solve_async, HARD, exclude=[999])
+
+	def test_solve_in_executor(self):
+		self.check_same_as_solve(solve_in_executor, EASY)
+		self.check_same_as_solve(solve_in_executor, HARD, max_difficulty=9)
+
+	def test_yields_between_strategies(self):
+		# No strategy up to unit intersections makes progress here, so the loop
+		# only gets control if it is yielded to between strategies
+		board = Sudoku(HARD)
+		board.solve(max_difficulty=9)
+		loop = asyncio.new_event_loop()
+		ticks = [0]
+		def tick():
+			ticks[0] += 1
+			loop.call_soon(tick)
+		loop.call_soon(tick)
+		try:
+			loop.run_until_complete(solve_async(board, max_difficulty=9))
+		finally:
+			loop.close()
+		self.assertGreaterEqual(ticks[0], len(board.strategies_for(max_difficulty=9)) - 1)
+
+if __name__ == '__main__':
+	unittest.main()
@@ -0,0 +1,73 @@
+from __future__ import print_function
+
+from board import Sudoku
+from strategies import *
+from tests.test_packed import pattern_line
+
+import gc
+import pickle
+import unittest
+import weakref
+
+HARD = '000000000000001002034000050000020030100006000700000000000300001000540000200000089'
+
+class BytesTest(unittest.TestCase):
+
+	def assertSameBoard(self, board, copy):
+		self.assertEqual([c.ds for c in copy.cells()], [c.ds for c in board.cells()])
+		for name in ['locations', 'candidate_cells', 'solved_values', 'solved_positions']:
+			self.assertEqual(getattr(copy, name), getattr(board, name), name)
+		self.assertEqual({m: b for m, b in copy.cells_by_candidates.items() if b},
+			{m: b for m, b in board.cells_by_candidates.items() if b})
+		self.assertTrue(all(c.sudoku() is copy for c in copy.cells()))
+
+	def test_round_trip_with_candidates(self):
+		board = Sudoku(HARD)
+		board.solve(max_difficulty=9)
+		self.assertFalse(board.solved())
+		data = board.to_bytes()
+		self.assertEqual(len(data), 93)
+		copy = Sudoku.from_bytes(data)
+		self.assertSameBoard(board, copy)
+		self.assertEqual(copy.to_bytes(), data)
+		board.solve()
+		copy.solve()
+		self.assertEqual(copy.code_str(), board.code_str())
+
+	def test_round_trip_sizes(self):
+		for box in [2, 3, 4, 5]:
+			board = Sudoku(pattern_line(box))
+			board.solve(include_only=[1])
+			data = board.to_bytes()
+			self.assertEqual(len(data), 1 + (box ** 6 + 7) // 8)
+			copy = Sudoku.from_bytes(data)
+			self.assertEqual(copy.size, box * box)
+			self.assertSameBoard(board, copy)
+
+	def test_pickle_keeps_settings(self):
+		board = Sudoku(HARD)
+		board.exhaustive = True
+		board.unique = False
+		copy = pickle.loads(pickle.dumps(board, pickle.HIGHEST_PROTOCOL))
+		self.assertSameBoard(board, copy)
+		self.assertTrue(copy.exhaustive)
+		self.assertFalse(copy.unique)
+
+class ReferenceTest(unittest.TestCase):
+
+	def test_board_freed_without_collector(self):
+		gc.disable()
+		try:
+			board = Sudoku(HARD)
+			board.copy().solve(max_difficulty=9)
+			board_ref, cells = weakref.ref(board), board.cells()
+			del board
+			self.assertIsNone(board_ref())
+		finally:
+			gc.enable()
+		# A cell left without a board can still lose candidates
+		self.assertIsNone(cells[0].sudoku())
+		self.assertTrue(cells[0].exclude({1}))
+
+if __name__ == '__main__':
+	unittest.main()
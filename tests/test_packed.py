@@ -0,0 +1,87 @@
+from __future__ import print_function
+
+from board import Sudoku
+from packed import *
+
+import os
+import shutil
+import tempfile
+import unittest
+
+def pattern_line(box, blank_every=3):
+	"""Return the text of a valid board with every few cells left unsolved."""
+	n = box * box
+	digits = [(box * (y % box) + y // box + x) % n + 1 for y in range(n) for x in range(n)]
+	return ''.join('0' if i % blank_every == 0 else Cell.SYMBOLS[d - 1]
+		for i, d in enumerate(digits))
+
+class PackedTest(unittest.TestCase):
+
+	def setUp(self):
+		self.directory = tempfile.mkdtemp()
+		self.text = os.path.join(self.directory, 'boards.txt')
+		self.packed = os.path.join(self.directory, 'boards.pack')
+
+	def tearDown(self):
+		shutil.rmtree(self.directory)
+
+	def pack(self, lines):
+		with open(self.text, 'w') as boards:
+			boards.write('# boards\n' + '\n'.join(lines) + '\n')
+		return pack_boards(self.text, self.packed)
+
+	def check_round_trip(self, lines):
+		n, errors = self.pack(lines)
+		self.assertEqual((n, errors), (len(lines), []))
+		self.assertTrue(is_packed(self.packed))
+		self.assertFalse(is_packed(self.text))
+		read = list(read_packed_boards(self.packed))
+		self.assertEqual([line for line, _ in read], lines)
+		for line, board in read:
+			self.assertEqual(board.code_str(), Sudoku(line).code_str())
+		return read
+
+	def test_round_trip_9x9(self):
+		with open(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+			'boards.txt')) as boards:
+			lines = [line.strip() for line in boards if line.strip()
+				and not line.startswith('#')][:50]
+		self.check_round_trip(lines)
+		self.assertEqual(os.path.getsize(self.packed), len(b'SUDOKU9\n') + 41 * len(lines))
+
+	def test_round_trip_other_sizes(self):
+		for box in [2, 4, 5]:
+			read = self.check_round_trip([pattern_line(box), pattern_line(box, 2)])
+			self.assertEqual(read[0][1].size, box * box)
+
+	def test_dots_are_unsolved(self):
+		line = pattern_line(3)
+		n, errors = self.pack([line.replace('0', '.')])
+		self.assertEqual(n, 1)
+		self.assertEqual([l for l, _ in read_packed_boards(self.packed)], [line])
+
+	def test_invalid_lines_are_reported(self):
+		lines = [pattern_line(3), '12345', pattern_line(4), pattern_line(3, 2)]
+		n, errors = self.pack(lines)
+		self.assertEqual(n, 2)
+		self.assertEqual([line for line, _ in errors], ['12345', pattern_line(4)])
+		self.assertEqual([l for l, _ in read_packed_boards(self.packed)],
+			[pattern_line(3), pattern_line(3, 2)])
+
+	def test_shards(self):
+		lines = [pattern_line(3, k) for k in range(2, 9)]
+		self.pack(lines)
+		with closing(PackedBoards(self.packed)) as boards:
+			self.assertEqual(len(boards), len(lines))
+			self.assertEqual(boards[-1].code_str(), Sudoku(lines[-1]).code_str())
+		shards = [[l for l, _ in read_packed_boards(self.packed, (k, 3))] for k in [1, 2, 3]]
+		self.assertEqual(sum(shards, []), lines)
+
+	def test_invalid_file(self):
+		for data in [b'SUDOKU9\n' + b'\0' * 40, b'SUDOKU8\n' + b'\0' * 32, b'SUDOKU']:
+			with open(self.packed, 'wb') as packed:
+				packed.write(data)
+			self.assertRaises(ValueError, PackedBoards, self.packed)
+
+if __name__ == '__main__':
+	unittest.main()
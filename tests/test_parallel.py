@@ -0,0 +1,159 @@
+from __future__ import print_function
+
+from board import Sudoku
+from strategies import *
+from parallel import StartPool
+from pipeline import Pipeline
+from ordering import UNSOLVED_COST, solve_longest_first
+from packed import pack_boards
+import shared
+
+import os
+import shutil
+import tempfile
+import unittest
+
+# Each needs a 3D Medusa, a dual Medusa, or a forcing chain
+CHAINS = [
+	'000000000000001002034000050000020030100006000700000000000300001000540000200000089',
+	'000000001000000020003004000000000500000060007042010000000002300010000060700800400',
+	'000000001000000023004005000000006400020000000710000000000010060000230000008700900',
+	'000000001000000023004005000000000600000007000028010000000004500030100000710000900',
+]
+
+# Has two solutions, but guesses solve it with the uniqueness strategies
+TWO_SOLUTIONS = '1000000000000002'
+
+# Solved with naked and hidden singles
+EASY = '003020600900305001001806400008102900700000008006708200002609500800203009005010300'
+
+# Has two 1s in its first row
+INVALID = '1100000000000000'
+
+# Boards that leave each tier of the pipeline, or fail
+LINES = [EASY] + CHAINS + [TWO_SOLUTIONS, INVALID]
+
+def solve_serially(line, guess, exhaustive=False, unique=True):
+	"""Return the result of solving a board in this process (or None), its
+	error (or None), and the solved board."""
+	board = Sudoku(line)
+	board.exhaustive = exhaustive
+	board.unique = unique
+	n = board.num_solved()
+	try:
+		strategy = board.solve(exclude=None if guess else [999])
+		board.verify()
+	except RuntimeError as e:
+		return None, str(e), None
+	return {'solved_cells': board.num_solved() - n, 'solved': board.solved(),
+		'board': line, 'strategy': strategy}, None, board.code_str()
+
+# The result and error of solving each board serially, keyed by its text and
+# settings, so that each is only solved once
+_serial_results = {}
+
+def serial_results(lines, guess, exhaustive=False):
+	"""Return the result and error of solving each board in this process, as
+	the parallel solvers report them."""
+	for line in lines:
+		if (line, guess, exhaustive) not in _serial_results:
+			_serial_results[line, guess, exhaustive] = solve_serially(line, guess, exhaustive)[:2]
+	return [_serial_results[line, guess, exhaustive] for line in lines]
+
+class StartPoolTest(unittest.TestCase):
+
+	@classmethod
+	def setUpClass(cls):
+		cls.pool = StartPool(2)
+
+	@classmethod
+	def tearDownClass(cls):
+		cls.pool.close()
+
+	def solve_in_pool(self, line, guess, exhaustive=False, unique=True):
+		Sudoku.pool = self.pool
+		try:
+			return solve_serially(line, guess, exhaustive, unique)
+		finally:
+			Sudoku.pool = None
+
+	def test_chains_match_serial(self):
+		for line in CHAINS:
+			self.assertEqual(self.solve_in_pool(line, False), solve_serially(line, False))
+
+	def test_guesses_match_serial(self):
+		result = solve_serially(TWO_SOLUTIONS, True)
+		self.assertEqual(result[0]['strategy'], 'guessing')
+		self.assertEqual(self.solve_in_pool(TWO_SOLUTIONS, True), result)
+
+	def test_unique_setting_reaches_workers(self):
+		# Without the uniqueness strategies, no guess solves or contradicts it
+		result = solve_serially(TWO_SOLUTIONS, True, unique=False)
+		self.assertFalse(result[0]['solved'])
+		self.assertEqual(self.solve_in_pool(TWO_SOLUTIONS, True, unique=False), result)
+
+class PipelineTest(unittest.TestCase):
+
+	def solve_in_tiers(self, lines, guess):
+		results = {}
+		def report(line, result, error):
+			results[line] = result, error
+		pipeline = Pipeline(report, guess, 2)
+		for line in lines:
+			pipeline.submit(line, Sudoku(line).num_solved())
+		pipeline.join()
+		self.assertEqual(sum(n for _, n in pipeline.tier_exits()), len(lines))
+		return [results[line] for line in lines]
+
+	def test_tiers_match_serial(self):
+		for guess in [False, True]:
+			self.assertEqual(self.solve_in_tiers(LINES, guess), serial_results(LINES, guess))
+
+class LongestFirstTest(unittest.TestCase):
+
+	def check_longest_first(self, solve, lines=LINES, **kwargs):
+		for guess, exhaustive in [(False, False), (True, False), (False, True)]:
+			solved = list(solve(lines, guess, exhaustive, 2, **kwargs))
+			self.assertEqual([line for line, _, _, _ in solved], lines)
+			self.assertEqual([(result, error) for _, result, error, _ in solved],
+				serial_results(lines, guess, exhaustive))
+
+	def test_matches_serial(self):
+		self.check_longest_first(solve_longest_first)
+
+	def test_matches_serial_with_costs(self):
+		costs = {CHAINS[0]: 14, CHAINS[2]: 17, TWO_SOLUTIONS: UNSOLVED_COST}
+		self.check_longest_first(solve_longest_first, costs=costs)
+
+@unittest.skipIf(shared.shared_memory is None, 'needs multiprocessing.shared_memory')
+class SharedTest(LongestFirstTest):
+
+	def setUp(self):
+		# Small chunks, so that every chunk reuses the block, except for the
+		# first one with 9x9 boards after 4x4 ones
+		self.chunk_size, shared.CHUNK_SIZE = shared.CHUNK_SIZE, 2
+		self.directory = tempfile.mkdtemp()
+
+	def tearDown(self):
+		shared.CHUNK_SIZE = self.chunk_size
+		shutil.rmtree(self.directory)
+
+	def check_longest_first(self, solve, lines=[TWO_SOLUTIONS] + LINES, **kwargs):
+		solve_shared = lambda lines, *args, **kwargs: shared.solve_longest_first_shared(
+			shared.line_grids(lines), *args, **kwargs)
+		LongestFirstTest.check_longest_first(self, solve_shared, lines, **kwargs)
+
+	def test_packed_grids(self):
+		lines = [EASY] + CHAINS
+		text = os.path.join(self.directory, 'boards.txt')
+		packed = os.path.join(self.directory, 'boards.pack')
+		with open(text, 'w') as boards:
+			boards.write('\n'.join(lines) + '\n')
+		pack_boards(text, packed)
+		grids = list(shared.packed_grids(packed))
+		self.assertEqual(grids, list(shared.line_grids(lines)))
+		self.assertEqual([data for _, data, _ in grids], [Sudoku(line).to_bytes() for line in lines])
+		self.assertEqual(list(shared.packed_grids(packed, (2, 2))), grids[2:])
+
+if __name__ == '__main__':
+	unittest.main()
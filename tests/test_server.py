@@ -0,0 +1,118 @@
+from __future__ import print_function
+
+from server import solve_request
+
+import json
+import os
+import shutil
+import signal
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+import unittest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Solved with naked and hidden singles
+EASY = '003020600900305001001806400008102900700000008006708200002609500800203009005010300'
+EASY_SOLUTION = '483921657967345821251876493548132976729564138136798245372689514814253769695417382'
+
+class SolveRequestTest(unittest.TestCase):
+
+	def test_solves_board(self):
+		result = solve_request({'id': 1, 'board': EASY})
+		self.assertEqual(result['id'], 1)
+		self.assertTrue(result['solved'])
+		self.assertEqual(result['board'], EASY_SOLUTION)
+		self.assertEqual(result['strategy'], 'naked singles')
+
+	def test_invalid_board(self):
+		result = solve_request({'id': 2, 'board': '123'})
+		self.assertEqual(result['id'], 2)
+		self.assertIn('error', result)
+		result = solve_request({'id': 3})
+		self.assertIn('error', result)
+
+	def test_invalid_max_difficulty(self):
+		for max_difficulty in ['x', True, [9]]:
+			result = solve_request({'id': 4, 'board': EASY, 'max_difficulty': max_difficulty})
+			self.assertEqual(result['id'], 4)
+			self.assertIn('error', result)
+
+	def test_max_difficulty(self):
+		result = solve_request({'board': EASY, 'max_difficulty': 0})
+		self.assertFalse(result['solved'])
+		self.assertEqual(result['board'].replace('.', '0'), EASY)
+
+	def test_hint(self):
+		result = solve_request({'board': EASY, 'hint': True})
+		step = result['step']
+		self.assertEqual(step['strategy'], 'naked singles')
+		# One cell's candidates ruled out by the solved cells it can see
+		self.assertEqual(len({c for c, _ in step['eliminations']}), 1)
+		self.assertTrue(step['cells'])
+		self.assertFalse(result['solved'])
+
+	def test_explain(self):
+		result = solve_request({'board': EASY, 'explain': True})
+		self.assertTrue(result['solved'])
+		self.assertIn('can only be', result['explanation'])
+
+class ServeTest(unittest.TestCase):
+
+	def setUp(self):
+		self.directory = tempfile.mkdtemp()
+		self.address = os.path.join(self.directory, 'sudoku.sock')
+
+	def tearDown(self):
+		shutil.rmtree(self.directory)
+
+	def start(self, *args):
+		server = subprocess.Popen([sys.executable, os.path.join(ROOT, 'sudoku.py'),
+			'-s', self.address] + list(args), cwd=ROOT)
+		for _ in range(200):
+			if os.path.exists(self.address):
+				break
+			time.sleep(0.05)
+		return server
+
+	def request(self, requests):
+		client = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+		client.settimeout(60)
+		client.connect(self.address)
+		client.sendall(''.join(json.dumps(r) + '\n' for r in requests).encode('utf-8'))
+		client.shutdown(socket.SHUT_WR)
+		data = b''
+		while True:
+			chunk = client.recv(4096)
+			if not chunk:
+				break
+			data += chunk
+		client.close()
+		results = [json.loads(line) for line in data.decode('utf-8').splitlines()]
+		return dict((r['id'], r) for r in results)
+
+	def check_serves(self, *args):
+		server = self.start(*args)
+		try:
+			results = self.request([{'id': 1, 'board': EASY},
+				{'id': 2, 'board': EASY, 'max_difficulty': 'x'}, {'id': 3, 'board': 'x'}])
+			self.assertEqual(sorted(results), [1, 2, 3])
+			self.assertEqual(results[1]['board'], EASY_SOLUTION)
+			self.assertIn('error', results[2])
+			self.assertIn('error', results[3])
+		finally:
+			server.send_signal(signal.SIGTERM)
+			self.assertEqual(server.wait(), 0)
+		self.assertFalse(os.path.exists(self.address))
+
+	def test_serve(self):
+		self.check_serves()
+
+	def test_serve_parallel(self):
+		self.check_serves('--parallel', '2')
+
+if __name__ == '__main__':
+	unittest.main()
@@ -0,0 +1,70 @@
+from __future__ import print_function
+
+from utils import *
+from board import Sudoku
+from strategies import *
+
+import unittest
+
+# Each needs naked and hidden pairs, unit intersections, and an X-wing or a Y-wing
+X_WING = '000000000000001002003040050000000006005370000080000001000500070060000000210009000'
+Y_WING = '000000001000002003004050000000000460010003000200000000000640700080070000530000000'
+
+# The size of the pattern each strategy deduces from
+PATTERN_SIZES = {'naked pairs': 2, 'hidden pairs': 2, 'X-wing': 4, 'Y-wing': 3}
+
+# Strategies that only eliminate candidates outside their pattern
+OUTSIDE_PATTERN = ['naked singles', 'naked pairs', 'unit intersection', 'X-wing', 'Y-wing']
+
+class StepsTest(unittest.TestCase):
+
+	def test_steps_solve_like_solve(self):
+		for line in [X_WING, Y_WING]:
+			board, solved = Sudoku(line), Sudoku(line)
+			solved.solve()
+			steps = list(board.steps())
+			self.assertTrue(board.solved())
+			self.assertEqual(board.code_str(), solved.code_str())
+			self.assertEqual(sum(len(s.eliminations) for s in steps),
+				sum(len(c.ds) - 1 for c in Sudoku(line).cells()))
+
+	def test_step_is_one_deduction(self):
+		for line in [X_WING, Y_WING]:
+			strategies = set()
+			for step in Sudoku(line).steps():
+				strategies.add(step.strategy)
+				self.assertTrue(step.eliminations)
+				self.assertTrue(step.cells)
+				if step.strategy in PATTERN_SIZES:
+					self.assertEqual(len(step.cells), PATTERN_SIZES[step.strategy])
+				if step.strategy in OUTSIDE_PATTERN:
+					self.assertFalse({c for c, _ in step.eliminations} & set(step.cells))
+				if step.strategy == 'naked singles':
+					self.assertEqual(len({c for c, _ in step.eliminations}), 1)
+			self.assertTrue(strategies & {'X-wing', 'Y-wing'})
+
+	def test_hint_applies_only_its_step(self):
+		board = Sudoku(X_WING)
+		masks = [c.mask for c in board.cells()]
+		step = next(board.steps())
+		eliminated = sum(len(bitmask_values(m & ~c.mask)) for c, m in zip(board.cells(), masks))
+		self.assertEqual(eliminated, len(step.eliminations))
+		self.assertFalse(board.stepping)
+		board.solve()
+		self.assertTrue(board.solved())
+
+	def test_unreported_pattern(self):
+		@Sudoku.strategy('clear first cell', 0.5)
+		def solve_clear_first_cell(sudoku, verbose):
+			cell = sudoku.cells()[0]
+			return cell.include_only({min(cell.ds)}) if not cell.solved() else False
+		try:
+			step = next(Sudoku(X_WING).steps(include_only=[0.5]))
+		finally:
+			del Sudoku.strategies[0.5]
+		self.assertEqual(step.strategy, 'clear first cell')
+		self.assertEqual(step.placements, [('A1', 1)])
+		self.assertEqual(step.cells, ['A1'])
+
+if __name__ == '__main__':
+	unittest.main()
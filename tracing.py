@@ -0,0 +1,59 @@
+from __future__ import print_function
+
+from board import Sudoku
+
+from collections import Counter
+from contextlib import contextmanager
+import random
+
+@contextmanager
+def hooked(hook):
+	"""Notify a hook around every strategy call within a with block."""
+	Sudoku.hooks.append(hook)
+	try:
+		yield hook
+	finally:
+		Sudoku.hooks.remove(hook)
+
+class StackSampler(object):
+	"""A strategy hook that adds up the time spent in each stack of nested
+	strategy calls (such as guessing, which solves copies of the board), and
+	writes it out as collapsed stacks for flame graph tools.
+
+	Only a random fraction of outermost strategy calls are traced, along with
+	the calls nested in them, so that it can run on a sample of real solves."""
+
+	def __init__(self, rate=1.0, root='solve', seed=None):
+		self.rate = rate
+		self.root = root
+		self.rng = random.Random(seed)
+		# The names of the traced strategy calls in progress, and the time
+		# spent so far in the calls nested in each one
+		self.stack = []
+		self.child_seconds = []
+		# How deep the untraced strategy calls in progress are
+		self.skipped = 0
+		# The time spent in each stack, not counting nested calls
+		self.seconds = Counter()
+
+	def start(self, sudoku, name, difficulty):
+		if self.skipped or (not self.stack and self.rng.random() >= self.rate):
+			self.skipped += 1
+			return
+		self.stack.append(name)
+		self.child_seconds.append(0)
+
+	def end(self, sudoku, name, difficulty, seconds, changed):
+		if self.skipped:
+			self.skipped -= 1
+			return
+		stack = ';'.join([self.root] + self.stack)
+		self.seconds[stack] += seconds - self.child_seconds.pop()
+		self.stack.pop()
+		if self.child_seconds:
+			self.child_seconds[-1] += seconds
+
+	def write(self, file):
+		"""Write each stack and its time in microseconds, one per line."""
+		for stack, seconds in sorted(self.seconds.items()):
+			print(stack, max(int(round(seconds * 1e6)), 0), file=file)
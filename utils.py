@@ -1,5 +1,7 @@
 from __future__ import print_function
 
+from functools import reduce
+
 def flatten(L):
 	"""Flatten an iterable of iterables into a single list."""
 	return [i for x in L for i in x]
@@ -29,6 +31,26 @@ def all_equal(s):
 	"""Return whether all elements in a list are equal."""
 	return len(set(s)) <= 1
 
+def bitmask(s):
+	"""Return an integer with the bits set at the positions in a collection."""
+	return sum(1 << i for i in set(s))
+
+def bitmask_values(m):
+	"""Return the list of bit positions that are set in an integer."""
+	values = []
+	while m:
+		bit = m & -m
+		values.append(bit.bit_length() - 1)
+		m ^= bit
+	return values
+
+# The number of bits that are set in each candidate bitmask of a 9x9 board
+POPCOUNTS = [bin(m).count('1') for m in range(1 << 10)]
+
+def popcount(m):
+	"""Return the number of bits that are set in an integer."""
+	return POPCOUNTS[m] if m < len(POPCOUNTS) else bin(m).count('1')
+
 def union(s):
 	"""Return the mutual union of a collection of collections."""
 	return reduce(set.union, s, set())